@@ -8,6 +8,8 @@ CREATE TABLE IF NOT EXISTS sentiment_history (
     fear_greed INTEGER,
     vix NUMERIC,
     summary_text TEXT,
+    -- Per-model scores and agreement stats when ensemble scoring is enabled.
+    model_scores JSONB,
     timestamp TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -22,3 +24,50 @@ CREATE TABLE IF NOT EXISTS vix_alerts_subscriptions (
     last_alert_sent_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
+
+-- One row per scraped article URL, with its lexicon sentiment score.
+CREATE TABLE IF NOT EXISTS news_articles (
+    id BIGSERIAL PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    source_name TEXT,
+    ticker VARCHAR(16),
+    title TEXT,
+    published_at TIMESTAMPTZ,
+    sentiment NUMERIC,
+    first_seen_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_articles_source_published
+    ON news_articles (source_name, published_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_news_articles_ticker_published
+    ON news_articles (ticker, published_at DESC);
+
+-- Hourly and daily aggregates of sentiment_history (UTC buckets), updated by
+-- analyze_news on every insert; rebuild with `flask --app website.appFlask backfill-rollups`.
+CREATE TABLE IF NOT EXISTS sentiment_rollup_hourly (
+    bucket TIMESTAMPTZ PRIMARY KEY,
+    samples INTEGER NOT NULL,
+    fg_sum BIGINT,
+    fg_count INTEGER NOT NULL DEFAULT 0,
+    fg_min INTEGER,
+    fg_max INTEGER,
+    vix_sum NUMERIC,
+    vix_count INTEGER NOT NULL DEFAULT 0,
+    vix_min NUMERIC,
+    vix_max NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS sentiment_rollup_daily (
+    bucket TIMESTAMPTZ PRIMARY KEY,
+    samples INTEGER NOT NULL,
+    fg_sum BIGINT,
+    fg_count INTEGER NOT NULL DEFAULT 0,
+    fg_min INTEGER,
+    fg_max INTEGER,
+    vix_sum NUMERIC,
+    vix_count INTEGER NOT NULL DEFAULT 0,
+    vix_min NUMERIC,
+    vix_max NUMERIC
+);
@@ -3,12 +3,20 @@
 Runs the scrape -> analyze pipeline and the VIX alert monitor on fixed
 intervals. Intervals are configurable through environment variables so the
 same code works locally and inside the Docker scheduler container.
+
+By default jobs run in-process: the job modules are imported once at
+startup and each run calls their entry point in a forked child (a thread
+where fork is unavailable), so no run pays interpreter startup and heavy
+imports again. SCHEDULER_RUN_MODE=subprocess restores one fresh Python
+process per run.
 """
 
 import logging
+import multiprocessing
 import os
 import subprocess
 import sys
+import threading
 import time
 
 import schedule
@@ -26,29 +34,103 @@ ALERT_MONITOR_SCRIPT_PATH = os.path.join(PROJECT_ROOT, "website", "crucialPys",
 PIPELINE_INTERVAL_MINUTES = int(os.environ.get("PIPELINE_INTERVAL_MINUTES", "25"))
 ALERT_INTERVAL_MINUTES = int(os.environ.get("ALERT_INTERVAL_MINUTES", "5"))
 SCRIPT_TIMEOUT_SECONDS = int(os.environ.get("SCRIPT_TIMEOUT_SECONDS", "900"))
+SCHEDULER_RUN_MODE = os.environ.get("SCHEDULER_RUN_MODE", "inprocess").lower()
 
 LOG_DIR = os.path.join(PROJECT_ROOT, "scheduler_logs")
-os.makedirs(LOG_DIR, exist_ok=True)
-
-logging.basicConfig(
-    level=os.environ.get("LOG_LEVEL", "INFO"),
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(os.path.join(LOG_DIR, "scheduler.log"), encoding="utf-8"),
-    ],
-)
+
 logger = logging.getLogger("scheduler")
 
 
-def run_script(script_path):
-    script_basename = os.path.basename(script_path)
+def configure_logging():
+    """Log to stderr and scheduler_logs/scheduler.log. Called when run as a
+    script, so importing the module (e.g. in tests) has no side effects."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(os.path.join(LOG_DIR, "scheduler.log"), encoding="utf-8"),
+        ],
+    )
 
-    if not os.path.exists(script_path):
-        logger.error("Script not found: %s", script_path)
+
+# Script path -> entry point, filled by load_job_functions() in in-process mode.
+_job_functions = {}
+# Threaded runs cannot be killed on timeout; remember them so a hung job is
+# not started a second time alongside itself.
+_running_threads = {}
+
+
+def load_job_functions():
+    """Import the job modules once and map each script to its entry point.
+    Returns an empty mapping (subprocess fallback) if the imports fail."""
+    started = time.monotonic()
+    try:
+        from website.crucialPys import alert_monitor, analyze_news, webScrape
+    except Exception:
+        logger.exception("Could not import job modules; falling back to subprocess execution")
+        return {}
+    # The job modules import their heavy dependencies lazily; pull them in
+    # once here so every forked run inherits them instead of re-importing.
+    try:
+        webScrape.preload_dependencies()
+        analyze_news.preload_dependencies()
+    except Exception:
+        logger.exception("Could not preload job dependencies; runs will import them on demand")
+    logger.info("Imported job modules in %.2fs", time.monotonic() - started)
+    return {
+        WEBSCRAPE_SCRIPT_PATH: webScrape.main,
+        ANALYZE_NEWS_SCRIPT_PATH: analyze_news.main,
+        ALERT_MONITOR_SCRIPT_PATH: alert_monitor.check_vix_and_send_alerts,
+    }
+
+
+def _run_forked(script_basename, func):
+    process = multiprocessing.get_context("fork").Process(target=func, name=script_basename)
+    process.start()
+    process.join(SCRIPT_TIMEOUT_SECONDS)
+    if process.is_alive():
+        process.terminate()
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        logger.error("%s timed out after %s seconds", script_basename, SCRIPT_TIMEOUT_SECONDS)
+        return False
+    if process.exitcode != 0:
+        logger.error("%s failed (exit code %s)", script_basename, process.exitcode)
         return False
+    return True
 
-    logger.info("Starting %s", script_basename)
+
+def _run_threaded(script_basename, func):
+    previous = _running_threads.get(script_basename)
+    if previous is not None and previous.is_alive():
+        logger.error("%s is still running from an earlier timed-out run; skipping", script_basename)
+        return False
+
+    outcome = {}
+
+    def target():
+        try:
+            func()
+            outcome["ok"] = True
+        except BaseException:
+            logger.exception("%s raised an exception", script_basename)
+            outcome["ok"] = False
+
+    thread = threading.Thread(target=target, name=script_basename, daemon=True)
+    _running_threads[script_basename] = thread
+    thread.start()
+    thread.join(SCRIPT_TIMEOUT_SECONDS)
+    if thread.is_alive():
+        logger.error("%s timed out after %s seconds", script_basename, SCRIPT_TIMEOUT_SECONDS)
+        return False
+    return outcome.get("ok", False)
+
+
+def _run_subprocess(script_path, script_basename):
     try:
         result = subprocess.run(
             [PYTHON_EXECUTABLE, script_path],
@@ -76,12 +158,47 @@ def run_script(script_path):
         )
         return False
 
-    logger.info("%s finished successfully", script_basename)
     if result.stdout:
         logger.debug("%s output:\n%s", script_basename, result.stdout)
     return True
 
 
+def run_script(script_path):
+    script_basename = os.path.basename(script_path)
+
+    if not os.path.exists(script_path):
+        logger.error("Script not found: %s", script_path)
+        return False
+
+    func = _job_functions.get(script_path)
+    if func is None:
+        mode = "subprocess"
+    elif "fork" in multiprocessing.get_all_start_methods():
+        mode = "fork"
+    else:
+        mode = "thread"
+
+    logger.info("Starting %s (%s)", script_basename, mode)
+    started = time.monotonic()
+    try:
+        if mode == "fork":
+            ok = _run_forked(script_basename, func)
+        elif mode == "thread":
+            ok = _run_threaded(script_basename, func)
+        else:
+            ok = _run_subprocess(script_path, script_basename)
+    except Exception:
+        logger.exception("Unexpected error while running %s", script_basename)
+        ok = False
+
+    elapsed = time.monotonic() - started
+    if ok:
+        logger.info("%s finished successfully in %.2fs", script_basename, elapsed)
+    else:
+        logger.error("%s did not complete successfully (%.2fs)", script_basename, elapsed)
+    return ok
+
+
 def job_run_webscrape():
     return run_script(WEBSCRAPE_SCRIPT_PATH)
 
@@ -103,11 +220,15 @@ def combined_pipeline_job():
 
 def main():
     logger.info(
-        "Scheduler starting (pipeline every %s min, alerts every %s min)",
+        "Scheduler starting (pipeline every %s min, alerts every %s min, %s mode)",
         PIPELINE_INTERVAL_MINUTES,
         ALERT_INTERVAL_MINUTES,
+        SCHEDULER_RUN_MODE,
     )
 
+    if SCHEDULER_RUN_MODE == "inprocess":
+        _job_functions.update(load_job_functions())
+
     schedule.every(PIPELINE_INTERVAL_MINUTES).minutes.do(combined_pipeline_job)
     schedule.every(ALERT_INTERVAL_MINUTES).minutes.do(job_run_alert_monitor)
 
@@ -125,6 +246,7 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
     try:
         main()
     except KeyboardInterrupt:
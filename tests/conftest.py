@@ -41,13 +41,19 @@ def no_json_cache(monkeypatch):
     # Keep tests deterministic: never pick up a real latest_indices.json
     # produced by previous pipeline runs on this machine.
     monkeypatch.setattr(flask_app_module, "LATEST_JSON_PATH", os.path.join(PROJECT_ROOT, "tests", "_no_such_cache.json"))
+    # Each test mocks its own DB rows, so no dashboard payload may carry over.
+    flask_app_module._dashboard_cache.clear()
 
 
 @pytest.fixture
 def mock_db_cursor(mocker):
     mock_cur = mocker.MagicMock(name="mock_db_cursor_from_fixture")
     mock_conn_obj = mocker.MagicMock(name="mock_db_connection_object")
-    mock_conn_obj.cursor.return_value.__enter__.return_value = mock_cur
+    # Same cursor whether used as a context manager or held open (named
+    # server-side cursors); iterating it yields the fetchall() rows.
+    mock_cur.__enter__.return_value = mock_cur
+    mock_cur.__iter__.side_effect = lambda: iter(mock_cur.fetchall.return_value)
+    mock_conn_obj.cursor.return_value = mock_cur
 
     mocker.patch('website.appFlask.get_db_connection', return_value=mock_conn_obj)
 
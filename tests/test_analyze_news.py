@@ -1,7 +1,8 @@
 import pytest
 import os
 import json
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from website.crucialPys import analyze_news
 
 def test_parse_analysis_results_with_fg():
@@ -130,6 +131,30 @@ def test_save_results_to_db_success(mocker):
     mock_cursor.execute.assert_called_once()
     mock_conn.commit.assert_called_once()
     mock_conn.close.assert_called_once()
+    # The history row and both rollup upserts share one statement.
+    sql = mock_cursor.execute.call_args.args[0]
+    assert "INSERT INTO sentiment_rollup_hourly" in sql and "INSERT INTO sentiment_rollup_daily" in sql
+
+def test_save_results_to_db_falls_back_on_unmigrated_schema(mocker):
+    mock_conn = mocker.MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    # No rollup tables, and sentiment_history has no model_scores column yet.
+    mock_cursor.execute.side_effect = [
+        analyze_news.psycopg2.errors.UndefinedTable("relation \"sentiment_rollup_hourly\" does not exist"),
+        analyze_news.psycopg2.errors.UndefinedColumn("column \"model_scores\" does not exist"),
+        None,
+    ]
+    mocker.patch.object(analyze_news, "connect_db", return_value=mock_conn)
+    timestamp = datetime.now(timezone.utc)
+
+    assert analyze_news.save_results_to_db({"fear_greed": 50, "summary_text": "s"}, 20.0, timestamp) is True
+
+    sql, params = mock_cursor.execute.call_args.args
+    assert "model_scores" not in sql and "rollup" not in sql
+    assert params == (50, 20.0, "s", timestamp)
+    assert mock_conn.rollback.call_count == 2
+    mock_conn.commit.assert_called_once()
+    mock_conn.close.assert_called_once()
 
 def test_save_results_to_db_no_credentials(mocker):
     mocker.patch('website.crucialPys.analyze_news.DB_NAME', "")
@@ -141,3 +166,431 @@ def test_save_results_to_db_no_credentials(mocker):
     dummy_timestamp = datetime.now(timezone.utc)
 
     assert analyze_news.save_results_to_db(dummy_analysis_data, dummy_vix, dummy_timestamp) is False
+
+
+def test_split_articles_into_batches_respects_token_budget():
+    articles = [{"title": "x" * 40} for _ in range(10)]
+    per_article = analyze_news.article_tokens(articles[0])
+    batches = analyze_news.split_articles_into_batches(articles, per_article * 3)
+    assert [len(b) for b in batches] == [3, 3, 3, 1]
+    assert [a for b in batches for a in b] == articles
+
+
+def test_analyze_in_chunks_merges_batch_scores_and_summaries(mocker):
+    articles = [{"title": f"article {i}"} for i in range(4)]
+    per_article = analyze_news.article_tokens(articles[0])
+
+    def fake_batch(batch, config):
+        score = 20 if batch[0]["title"] == "article 0" else 80
+        return f"<think>hmm</think>Batch of {len(batch)}.\nFEAR AND GREED INDEX = {score}"
+
+    mocker.patch.object(analyze_news, "analyze_with_ollama", side_effect=fake_batch)
+    reduce_mock = mocker.patch.object(analyze_news, "ollama_generate", return_value="Merged view of the market.")
+
+    text = analyze_news.analyze_in_chunks(articles, "ollama", {}, token_budget=per_article * 3)
+    parsed = analyze_news.parse_analysis_results(text)
+
+    # Batches of 3 and 1 articles: weighted mean (20*3 + 80*1) / 4 = 35.
+    assert parsed == {"fear_greed": 35, "summary_text": "Merged view of the market."}
+    assert "batch score 20" in reduce_mock.call_args.args[0]
+
+
+def test_analyze_in_chunks_concatenates_when_reduce_fails(mocker):
+    articles = [{"title": "a"}, {"title": "b"}]
+    mocker.patch.object(analyze_news, "analyze_with_cloud", side_effect=["One.\nFEAR AND GREED INDEX = 40", None])
+    mocker.patch.object(analyze_news, "cloud_complete", return_value=None)
+
+    text = analyze_news.analyze_in_chunks(articles, "cloud", {}, token_budget=1)
+    assert analyze_news.parse_analysis_results(text) == {"fear_greed": 40, "summary_text": "One."}
+
+
+def test_merge_partial_scores_ignores_guessed_batch_scores(mocker):
+    articles = [{"title": "a"}, {"title": "b"}, {"title": "c"}]
+    # The middle batch has no marker; the parser would guess 15 from its wording.
+    mocker.patch.object(analyze_news, "analyze_with_cloud", side_effect=[
+        "Calm.\nFEAR AND GREED INDEX = 60", "Pockets of extreme fear.", "Steady.\nFEAR AND GREED INDEX = 40"])
+    mocker.patch.object(analyze_news, "cloud_complete", return_value="Mixed.")
+
+    text = analyze_news.analyze_in_chunks(articles, "cloud", {}, token_budget=1)
+
+    assert analyze_news.parse_analysis_results(text)["fear_greed"] == 50
+
+
+def test_pack_articles_compacts_dedupes_and_budgets():
+    articles = [
+        {"title": "Stocks rally as Fed signals cuts - Reuters", "url": "https://a", "summary": "Stocks rally as Fed signals cuts - Reuters",
+         "timestamp": "2024-01-01T10:00:00Z", "source_name": "RSS (Google News Finance)"},
+        {"title": "Stocks rally as Fed signals cuts", "url": "https://b", "summary": "Publisher: Yahoo", "source_name": "Yahoo Finance"},
+        {"title": "Oil slides on demand worries", "url": "https://c", "summary": "x " * 300, "source_name": "RSS (CNBC Top News)"},
+        {"title": "Late story", "url": "https://d", "summary": "N/A", "source_name": "Yahoo Finance"},
+    ]
+    first_two = analyze_news.article_tokens(articles[0]) + analyze_news.article_tokens(articles[2])
+
+    packed, report = analyze_news.pack_articles(articles, token_budget=first_two)
+
+    assert [a["url"] for a in packed] == ["https://a", "https://c"]
+    assert report["duplicates_dropped"] == 1 and report["over_budget_dropped"] == 1
+    assert report["tokens_saved"] > 0
+
+    prompt_lines = analyze_news.format_articles_for_prompt(packed).splitlines()
+    assert prompt_lines[0] == "- Stocks rally as Fed signals cuts - Reuters (Google News Finance)"
+    assert "https://" not in "\n".join(prompt_lines)
+    assert prompt_lines[1].endswith("... (CNBC Top News)")
+    assert len(prompt_lines[1]) < analyze_news.PROMPT_SUMMARY_MAX_CHARS + 60
+
+
+def test_analyze_articles_prefilter_keeps_newest_first_order(mocker):
+    mocker.patch.object(analyze_news, "LEXICON_PREFILTER", True)
+    mocker.patch.object(analyze_news, "LEXICON_PREFILTER_TOP_N", 2)
+    chain = mocker.patch.object(analyze_news, "run_provider_chain", return_value="Ok.\nFEAR AND GREED INDEX = 50")
+    newest_first = [
+        {"title": "Stocks rise modestly", "source": "A"},
+        {"title": "Weather is mild across the country", "source": "B"},
+        {"title": "Markets crash in panic selloff", "source": "C"},
+    ]
+
+    analyze_news.analyze_articles(newest_first, {})
+
+    # The neutral story is dropped, but the strongest one is not moved to the front.
+    assert chain.call_args.args[0] == [newest_first[0], newest_first[2]]
+
+
+@pytest.fixture
+def isolated_analysis_state(tmp_path, mocker):
+    mocker.patch.object(analyze_news, "ANALYSIS_STATE_PATH", str(tmp_path / "analysis_state.json"))
+    mocker.patch.object(analyze_news, "ANALYSIS_MODE", "incremental")
+    mocker.patch.object(analyze_news, "FULL_REANALYSIS_INTERVAL_HOURS", 6)
+
+
+def test_run_analysis_incremental_sends_only_new_articles(isolated_analysis_state, mocker):
+    window = [{"url": f"https://n/{i}", "title": f"story {i}"} for i in range(4)]
+    analyze = mocker.patch.object(analyze_news, "analyze_articles", return_value="Calm.\nFEAR AND GREED INDEX = 40")
+    t0 = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    assert analyze_news.run_analysis(window, {}, now=t0) == {"fear_greed": 40, "summary_text": "Calm."}
+
+    # One article rotates out, one new article arrives.
+    next_window = window[1:] + [{"url": "https://n/9", "title": "crash fears"}]
+    analyze.return_value = "Panic.\nFEAR AND GREED INDEX = 80"
+    result = analyze_news.run_analysis(next_window, {}, now=t0 + timedelta(minutes=25))
+
+    assert analyze.call_args.args[0] == [next_window[-1]]
+    # 3/4 prior score + 1/4 new score: 0.75 * 40 + 0.25 * 80 = 50.
+    assert result == {"fear_greed": 50, "summary_text": "Calm.\n\nLatest update (1 new article): Panic."}
+    state = analyze_news.load_analysis_state()
+    assert len(state["fingerprints"]) == 4
+
+    # A later update replaces the previous one rather than piling up.
+    analyze.return_value = "Relief.\nFEAR AND GREED INDEX = 50"
+    later_window = next_window[1:] + [{"url": "https://n/10", "title": "rebound"}]
+    result = analyze_news.run_analysis(later_window, {}, now=t0 + timedelta(minutes=50))
+    assert result["summary_text"] == "Calm.\n\nLatest update (1 new article): Relief."
+
+
+def test_run_analysis_reuses_state_without_new_articles_and_runs_full_on_cadence(isolated_analysis_state, mocker):
+    window = [{"url": "https://n/1", "title": "story"}]
+    analyze = mocker.patch.object(analyze_news, "analyze_articles", return_value="Ok.\nFEAR AND GREED INDEX = 55")
+    t0 = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    analyze_news.run_analysis(window, {}, now=t0)
+
+    assert analyze_news.run_analysis(window, {}, now=t0 + timedelta(hours=1)) == {"fear_greed": 55, "summary_text": "Ok."}
+    assert analyze.call_count == 1
+
+    analyze_news.run_analysis(window, {}, now=t0 + timedelta(hours=7))
+    assert analyze.call_count == 2
+    assert analyze.call_args.args[0] == window
+
+
+@pytest.fixture
+def isolated_llm_cache(tmp_path, mocker):
+    mocker.patch.object(analyze_news, "LLM_CACHE_DIR", str(tmp_path / "llm_cache"))
+    mocker.patch.object(analyze_news, "LLM_CACHE_TTL_HOURS", 1)
+    mocker.patch.dict(analyze_news._llm_cache_stats, {"hits": 0, "misses": 0})
+    return tmp_path / "llm_cache"
+
+
+def test_ollama_generate_serves_identical_prompt_from_cache(isolated_llm_cache, mocker):
+    response = mocker.Mock()
+    response.json.return_value = {"response": "Summary.\nFEAR AND GREED INDEX = 60"}
+    post = mocker.patch.object(analyze_news.http_client.get_session(), "post", return_value=response)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", False)
+    config = {"model": "m1"}
+
+    first = analyze_news.ollama_generate("prompt A", config)
+    second = analyze_news.ollama_generate("prompt A", config)
+    analyze_news.ollama_generate("prompt A", {"model": "m2"})
+
+    assert first == second == "Summary.\nFEAR AND GREED INDEX = 60"
+    assert post.call_count == 2
+    assert analyze_news._llm_cache_stats == {"hits": 1, "misses": 2}
+
+
+@pytest.mark.parametrize("provider", ["ollama", "cloud"])
+def test_unparseable_llm_response_is_not_cached(isolated_llm_cache, mocker, provider):
+    response = mocker.Mock()
+    response.json.return_value = {"response": "I cannot help with that.",
+                                  "choices": [{"message": {"content": "I cannot help with that."}}]}
+    post = mocker.patch.object(analyze_news.http_client.get_session(), "post", return_value=response)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", False)
+
+    for _ in range(2):
+        if provider == "ollama":
+            text = analyze_news.ollama_generate("prompt", {"model": "m"})
+        else:
+            text = analyze_news.cloud_complete("sys", "user", {"provider_type": "openai", "endpoint": "http://c", "api_key": "k", "model": "m"})
+        assert text == "I cannot help with that."
+
+    assert post.call_count == 2
+    assert not isolated_llm_cache.exists() or not any(isolated_llm_cache.iterdir())
+
+
+def test_llm_cache_expires_and_evicts_least_recently_used(isolated_llm_cache, mocker):
+    real_time = time.time()
+    mocker.patch.object(analyze_news.time, "time", return_value=real_time - 7200)
+    analyze_news.llm_cache_put("old", "x" * 100)
+    mocker.patch.object(analyze_news.time, "time", return_value=real_time)
+
+    assert analyze_news.llm_cache_get("old") is None  # older than the 1h TTL
+    assert not (isolated_llm_cache / "old.json").exists()
+
+    analyze_news.llm_cache_put("a", "y" * 100)
+    analyze_news.llm_cache_put("b", "y" * 100)
+    os.utime(isolated_llm_cache / "a.json", (real_time - 20, real_time - 20))
+    os.utime(isolated_llm_cache / "b.json", (real_time - 30, real_time - 30))
+    assert analyze_news.llm_cache_get("b") is not None  # refreshes b's LRU position
+
+    entry_size = (isolated_llm_cache / "a.json").stat().st_size
+    mocker.patch.object(analyze_news, "LLM_CACHE_MAX_BYTES", entry_size * 2 + 10)
+    analyze_news.llm_cache_put("c", "y" * 100)
+
+    assert sorted(p.name for p in isolated_llm_cache.iterdir()) == ["b.json", "c.json"]
+
+
+def test_strip_think_stream_handles_tags_split_across_chunks():
+    chunks = ["Intro <th", "ink>secret ", "reasoning</thi", "nk>Visible", " text <", "b>"]
+    assert "".join(analyze_news.strip_think_stream(chunks)) == "Intro Visible text <b>"
+
+
+def test_ollama_generate_streams_and_stops_at_marker(tmp_path, mocker):
+    mocker.patch.object(analyze_news, "LLM_CACHE_TTL_HOURS", 0)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", True)
+    pieces = ["<think>", "weighing", "</think>", "Markets calm.\n", "FEAR AND GREED INDEX = ", "7", "2", "\n", "ignored tail"]
+    consumed = []
+
+    def iter_lines():
+        for piece in pieces:
+            consumed.append(piece)
+            yield json.dumps({"response": piece, "done": False}).encode()
+        yield json.dumps({"response": "", "done": True}).encode()
+
+    response = mocker.Mock()
+    response.iter_lines.side_effect = iter_lines
+    post = mocker.patch.object(analyze_news.http_client.get_session(), "post", return_value=response)
+
+    text = analyze_news.ollama_generate("prompt", {"model": "m"})
+
+    assert text == "Markets calm.\nFEAR AND GREED INDEX = 72"
+    assert "ignored tail" not in consumed
+    assert post.call_args.kwargs["json"]["stream"] is True
+    response.close.assert_called_once()
+    assert analyze_news.parse_analysis_results(text)["fear_greed"] == 72
+
+
+def test_cloud_complete_streams_openai_compatible_sse(mocker):
+    mocker.patch.object(analyze_news, "LLM_CACHE_TTL_HOURS", 0)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", True)
+    events = [
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        "",
+        'data: {"choices": [{"delta": {"content": "Risk-on mood."}}]}',
+        'data: {"choices": [{"delta": {"content": " FEAR AND GREED INDEX = 64"}}]}',
+        "data: [DONE]",
+    ]
+    response = mocker.Mock()
+    response.iter_lines.return_value = iter(events)
+    mocker.patch.object(analyze_news.http_client.get_session(), "post", return_value=response)
+
+    text = analyze_news.cloud_complete("sys", "user", {"provider_type": "openai", "endpoint": "https://x", "api_key": "k", "model": "m"})
+    assert text == "Risk-on mood. FEAR AND GREED INDEX = 64"
+
+
+@pytest.fixture
+def isolated_provider_stats(tmp_path, mocker):
+    mocker.patch.object(analyze_news, "PROVIDER_STATS_PATH", str(tmp_path / "llm_provider_stats.json"))
+
+
+def test_provider_chain_defaults_to_active_provider_only(mocker):
+    mocker.patch.object(analyze_news, "LLM_PROVIDER_CHAIN", [])
+    config = {"provider": "ollama", "ollama": {"model": "m"}, "cloud": {"endpoint": "https://x", "api_key": "k"}}
+    # Cloud credentials alone never opt into billed fallback calls.
+    assert analyze_news.provider_chain(config) == ["ollama"]
+
+    mocker.patch.object(analyze_news, "LLM_PROVIDER_CHAIN", ["ollama", "cloud"])
+    assert analyze_news.provider_chain(config) == ["ollama", "cloud"]
+    assert analyze_news.provider_chain({**config, "provider_chain": ["cloud"]}) == ["cloud"]
+
+
+def test_provider_chain_falls_back_when_primary_fails(isolated_provider_stats, mocker):
+    config = {"provider_chain": ["ollama", "cloud"], "ollama": {"model": "m"}, "cloud": {"endpoint": "https://x", "api_key": "k"}}
+    calls = mocker.patch.object(analyze_news, "analyze_with_provider", side_effect=lambda a, name, c: (
+        "Garbled output" if name == "ollama" else "Fine.\nFEAR AND GREED INDEX = 62"))
+
+    text = analyze_news.run_provider_chain([{"title": "x"}], config)
+
+    assert analyze_news.parse_analysis_results(text)["fear_greed"] == 62
+    assert [c.args[1] for c in calls.call_args_list] == ["ollama", "cloud"]
+    stats = analyze_news.load_provider_stats()
+    assert stats["ollama"]["outcomes"] == {"invalid": 1}
+    assert stats["cloud"]["outcomes"] == {"success": 1}
+    assert sum(stats["cloud"]["latency_histogram"].values()) == 1
+
+
+def test_provider_chain_hedges_slow_primary(isolated_provider_stats, mocker):
+    mocker.patch.object(analyze_news, "LLM_HEDGE_DEFAULT_DELAY", 0.05)
+    config = {"provider_chain": ["ollama", "cloud"], "ollama": {}, "cloud": {}}
+
+    def fake(articles, name, provider_config):
+        if name == "ollama":
+            time.sleep(2)
+            return "Slow.\nFEAR AND GREED INDEX = 10"
+        return "Fast.\nFEAR AND GREED INDEX = 70"
+
+    mocker.patch.object(analyze_news, "analyze_with_provider", side_effect=fake)
+    started = time.monotonic()
+    text = analyze_news.run_provider_chain([{"title": "x"}], config)
+
+    assert analyze_news.parse_analysis_results(text)["fear_greed"] == 70
+    assert time.monotonic() - started < 1.5
+
+
+def test_hedge_delay_uses_latency_percentile():
+    stats = {}
+    for latency in range(1, 11):
+        analyze_news.record_provider_result(stats, "cloud", "success", float(latency))
+    assert analyze_news.hedge_delay(stats, "cloud") == 9.0
+    assert analyze_news.hedge_delay(stats, "ollama") == analyze_news.LLM_HEDGE_DEFAULT_DELAY
+
+
+def test_aggregate_scores_median_and_trimmed_mean(mocker):
+    mocker.patch.object(analyze_news, "ENSEMBLE_TRIM_FRACTION", 0.2)
+    median = analyze_news.aggregate_scores([40, 90, 45, 50, 42])
+    assert median["value"] == 45 and median["spread"] == 50
+    assert median["agreement"] == 0.8
+
+    trimmed = analyze_news.aggregate_scores([40, 90, 45, 50, 42], method="trimmed_mean")
+    # Drops 40 and 90: (42 + 45 + 50) / 3.
+    assert trimmed["value"] == 45.67
+
+
+def test_analyze_ensemble_runs_members_in_parallel_and_ignores_guesses(mocker):
+    config = {"ollama": {"endpoint": "http://o"}, "ensemble": [
+        {"provider": "ollama", "model": "a"}, {"provider": "ollama", "model": "b"}, {"provider": "ollama", "model": "c"},
+    ]}
+    outputs = {"a": "Bullish.\nFEAR AND GREED INDEX = 70", "b": "Neutral.\nFEAR AND GREED INDEX = 60", "c": "Some extreme fear here."}
+
+    def fake(articles, provider, provider_config):
+        time.sleep(0.3)
+        return outputs[provider_config["model"]]
+
+    mocker.patch.object(analyze_news, "analyze_with_provider", side_effect=fake)
+    started = time.monotonic()
+    text, details = analyze_news.analyze_ensemble([{"title": "x"}], config)
+
+    assert time.monotonic() - started < 0.8
+    assert analyze_news.parse_analysis_results(text)["fear_greed"] == 65
+    assert [m["fear_greed"] for m in details["models"]] == [70, 60, 15]
+    assert [m["explicit"] for m in details["models"]] == [True, True, False]
+    assert details["value"] == 65
+
+
+def test_analyze_ensemble_members_differing_in_temperature_send_distinct_requests(isolated_llm_cache, mocker):
+    # The same model listed twice (differing only in temperature) shares a label.
+    config = {"ollama": {"endpoint": "http://o", "model": "m"}, "ensemble": [
+        {"provider": "ollama", "temperature": 0.2}, {"provider": "ollama", "temperature": 0.9},
+    ]}
+    outputs = {0.2: "Calm.\nFEAR AND GREED INDEX = 40", 0.9: "Hot.\nFEAR AND GREED INDEX = 80"}
+
+    def fake_post(endpoint, json=None, **kwargs):
+        return mocker.Mock(json=mocker.Mock(return_value={"response": outputs[json["options"]["temperature"]]}))
+
+    post = mocker.patch.object(analyze_news.http_client.get_session(), "post", side_effect=fake_post)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", False)
+
+    for _ in range(2):  # the second run is served from the cache
+        text, details = analyze_news.analyze_ensemble([{"title": "x"}], config)
+        assert [m["model"] for m in details["models"]] == ["ollama:m", "ollama:m"]
+        assert [m["fear_greed"] for m in details["models"]] == [40, 80]
+        assert details["value"] == 60
+        assert analyze_news.parse_analysis_results(text)["fear_greed"] == 60
+
+    assert sorted(c.kwargs["json"]["options"]["temperature"] for c in post.call_args_list) == [0.2, 0.9]
+
+
+def test_cloud_complete_sends_member_temperature(isolated_llm_cache, mocker):
+    response = mocker.Mock()
+    response.json.return_value = {"choices": [{"message": {"content": "Ok.\nFEAR AND GREED INDEX = 50"}}]}
+    post = mocker.patch.object(analyze_news.http_client.get_session(), "post", return_value=response)
+    mocker.patch.object(analyze_news, "LLM_STREAMING", False)
+    config = {"provider_type": "openai", "endpoint": "http://c", "api_key": "k", "model": "m"}
+
+    analyze_news.cloud_complete("sys", "user", {**config, "temperature": 0.1})
+    analyze_news.cloud_complete("sys", "user", {**config, "temperature": 1.0})
+
+    assert [c.kwargs["json"]["temperature"] for c in post.call_args_list] == [0.1, 1.0]
+
+
+def test_main_falls_back_to_lexicon_score_when_llm_fails(tmp_path, mocker):
+    articles = [{"title": "Stocks plunge as recession fears spread", "summary": ""}]
+    mocker.patch.object(analyze_news, "load_data_from_json", return_value=(articles, 30.0))
+    mocker.patch.object(analyze_news, "load_ai_config", return_value={"provider": "ollama", "ollama": {}})
+    mocker.patch.object(analyze_news, "run_analysis", return_value=None)
+    mocker.patch.object(analyze_news, "INDEX_JSON_OUTPUT_PATH", str(tmp_path / "latest_indices.json"))
+    mock_conn = mocker.MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mocker.patch.object(analyze_news, "connect_db", return_value=mock_conn)
+    mocker.patch.object(analyze_news, "save_articles_to_db", return_value=1)
+
+    analyze_news.main()
+
+    saved = json.loads((tmp_path / "latest_indices.json").read_text())
+    assert saved["scorer"] == "lexicon" and saved["fear_greed"] < 50
+    # The stored history row records that the lexicon, not an LLM, scored it.
+    fear_greed, vix, summary, model_scores, _ = mock_cursor.execute.call_args.args[1]
+    assert fear_greed == saved["fear_greed"] and vix == 30.0
+    assert model_scores.adapted == {"scorer": "lexicon"}
+    assert summary.startswith("LLM analysis unavailable")
+    mock_conn.commit.assert_called_once()
+
+
+def test_save_articles_to_db_upserts_unique_urls_in_one_batch(mocker):
+    mocker.patch.dict(os.environ, {"DB_NAME": "testdb", "DB_USER": "user", "DB_PASS": "pass", "DB_HOST": "localhost"})
+    mock_conn = mocker.MagicMock()
+    mocker.patch('website.crucialPys.analyze_news.psycopg2.connect', return_value=mock_conn)
+    execute_values = mocker.patch.object(analyze_news, "execute_values")
+    articles = [{"url": f"https://n/{i}", "title": "Stocks soar", "source_name": "Yahoo Finance", "ticker": "SPY",
+                 "timestamp": "2024-01-01T10:00:00Z"} for i in range(300)]
+    articles.append({"url": "https://n/0", "title": "Stocks crash", "source_name": "Yahoo Finance"})
+    seen_at = datetime.now(timezone.utc)
+
+    assert analyze_news.save_articles_to_db(articles, seen_at) == 300
+
+    execute_values.assert_called_once()
+    sql, rows = execute_values.call_args.args[1:3]
+    assert "ON CONFLICT (url)" in sql
+    assert len(rows) == 300 and execute_values.call_args.kwargs["page_size"] >= 300
+    # The last occurrence of a duplicated URL wins, at its first position.
+    assert rows[0][0] == "https://n/0" and rows[0][3] == "Stocks crash" and rows[0][5] < 0
+    assert rows[1][2] == "SPY" and rows[1][5] > 0
+    mock_conn.commit.assert_called_once()
+
+
+def test_save_articles_to_db_rolls_back_and_closes_on_error(mocker):
+    mock_conn = mocker.MagicMock()
+    mocker.patch.object(analyze_news, "connect_db", return_value=mock_conn)
+    mocker.patch.object(analyze_news, "execute_values", side_effect=analyze_news.psycopg2.OperationalError("server closed"))
+
+    assert analyze_news.save_articles_to_db([{"url": "https://n/1", "title": "t"}], datetime.now(timezone.utc)) is None
+
+    mock_conn.commit.assert_not_called()
+    mock_conn.rollback.assert_called_once()
+    mock_conn.close.assert_called_once()
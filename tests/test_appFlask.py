@@ -1,5 +1,16 @@
+import gzip
+import io
 import json
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import psycopg2.extensions
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from website import appFlask as flask_app_module
 
 
 def test_index_route_no_data(client, mock_db_cursor):
@@ -106,3 +117,273 @@ def test_run_script_busy_returns_409(client, mocker):
         assert response.get_json()["status"] == "error"
     finally:
         app_module._script_lock.release()
+
+
+def test_healthz_reports_pool_utilization(client, mocker):
+    conn = mocker.MagicMock(closed=0)
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    mocker.patch.object(flask_app_module, "_connect", return_value=conn)
+    mocker.patch.object(flask_app_module, "_pool", None)
+
+    payload = client.get('/healthz').get_json()
+
+    assert payload["database"] == "up"
+    assert payload["pool"]["size"] == 1 and payload["pool"]["in_use"] == 0 and payload["pool"]["idle"] == 1
+
+
+def test_dashboard_cache_skips_db_until_latest_json_changes(client, mock_db_cursor, mocker, tmp_path):
+    latest_json = tmp_path / "latest_indices.json"
+    latest_json.write_text(json.dumps({"fear_greed": 40}))
+    mocker.patch.object(flask_app_module, "LATEST_JSON_PATH", str(latest_json))
+    mock_db_cursor.fetchone.return_value = {"fear_greed": 40, "vix": 15.0, "summary_text": "Calm", "timestamp": datetime(2023, 1, 1, 12, 0)}
+    mock_db_cursor.fetchall.return_value = []
+
+    client.get('/')
+    queries = mock_db_cursor.execute.call_count
+    client.get('/')
+    assert mock_db_cursor.execute.call_count == queries
+
+    # A different date filter is cached separately.
+    client.get('/?start_date=2023-01-01')
+    queries = mock_db_cursor.execute.call_count
+    client.get('/?start_date=2023-01-01')
+    assert mock_db_cursor.execute.call_count == queries
+
+    # analyze_news rewriting the JSON file invalidates the cache.
+    mock_db_cursor.fetchone.return_value = {"fear_greed": 75, "vix": 12.0, "summary_text": "Greedy", "timestamp": datetime(2023, 1, 1, 12, 25)}
+    latest_json.write_text(json.dumps({"fear_greed": 75}))
+    os.utime(latest_json, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+    response = client.get('/')
+    assert mock_db_cursor.execute.call_count > queries
+    assert "const fearGreedRawValue = '75';" in response.data.decode('utf-8')
+
+
+def test_api_latest_and_history_etag_and_304(client, mock_db_cursor):
+    ts = datetime(2023, 1, 1, 12, 0)
+    mock_db_cursor.fetchone.return_value = {"id": 42, "fear_greed": 60, "vix": 18.5, "summary_text": "Steady", "timestamp": ts}
+    mock_db_cursor.fetchall.return_value = [{"id": 42, "fear_greed": 60, "vix": 18.5, "summary_text": "Steady", "timestamp": ts}]
+
+    response = client.get('/api/latest')
+    assert response.status_code == 200
+    assert response.get_json() == {"id": 42, "fear_greed": 60, "vix": 18.5, "summary_text": "Steady", "timestamp": ts.isoformat()}
+    assert response.headers["ETag"] == '"latest-42"'
+    assert "max-age" in response.headers["Cache-Control"]
+
+    assert client.get('/api/latest', headers={"If-None-Match": '"latest-42"'}).status_code == 304
+
+    history = client.get('/api/history?start_date=2023-01-01')
+    assert [row["id"] for row in history.get_json()["history"]] == [42]
+    etag = history.headers["ETag"]
+    assert etag.startswith('"history-42-') and etag != client.get('/api/history').headers["ETag"]
+    assert client.get('/api/history?start_date=2023-01-01', headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_api_latest_without_db_has_no_etag(client, mocker):
+    mocker.patch('website.appFlask.get_db_connection', return_value=None)
+    response = client.get('/api/latest')
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_export_csv_streams_from_named_cursor_with_gzip(client, mock_db_cursor, mocker):
+    mocker.patch.object(flask_app_module, "EXPORT_ITERSIZE", 2)
+    mock_db_cursor.fetchall.return_value = [
+        {"fear_greed": 50 + i, "vix": 15.0, "summary_text": f"row {i}", "timestamp": datetime(2023, 1, 3 - i, 9, 0)} for i in range(3)
+    ]
+
+    response = client.get('/export/csv?start_date=2023-01-01', headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+    assert lines[0] == "timestamp,fear_greed,vix,summary_text"
+    assert [line.split(",")[1] for line in lines[1:]] == ["50", "51", "52"]
+
+    conn = flask_app_module.get_db_connection()
+    assert conn.cursor.call_args.kwargs["name"] == "history_export"
+    assert mock_db_cursor.itersize == 2
+    mock_db_cursor.close.assert_called_once()
+
+
+def test_export_csv_head_request_releases_connection(client, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = [
+        {"fear_greed": 50, "vix": 15.0, "summary_text": "row", "timestamp": datetime(2023, 1, 1, 9, 0)}
+    ]
+
+    # The WSGI server closes the response without ever iterating its body.
+    with client.head('/export/csv') as response:
+        assert response.status_code == 200
+    mock_db_cursor.close.assert_called_once()
+    flask_app_module.get_db_connection().close.assert_called_once()
+
+
+def _history_rows():
+    return [
+        {"id": 2, "fear_greed": 61, "vix": 14.5, "summary_text": "Up", "timestamp": datetime(2023, 1, 2, 9, 0, tzinfo=timezone.utc)},
+        {"id": 1, "fear_greed": 40, "vix": None, "summary_text": "Down", "timestamp": datetime(2023, 1, 1, 9, 0, tzinfo=timezone.utc)},
+    ]
+
+
+def test_export_ndjson_streams_typed_records(client, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = _history_rows()
+
+    response = client.get('/export?format=ndjson&start_date=2023-01-01&end_date=2023-01-02')
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+    assert records[0] == {"id": 2, "timestamp": "2023-01-02T09:00:00+00:00", "fear_greed": 61, "vix": 14.5, "summary_text": "Up"}
+    assert records[1]["vix"] is None
+    sql, params = mock_db_cursor.execute.call_args.args
+    assert "timestamp >= %s AND timestamp <= %s" in sql and len(params) == 2
+
+
+def test_export_rejects_unknown_format_and_missing_pyarrow(client, mock_db_cursor, mocker):
+    assert client.get('/export?format=xlsx').status_code == 400
+    mocker.patch.object(flask_app_module, "PYARROW_AVAILABLE", False)
+    assert client.get('/export?format=parquet').status_code == 501
+
+
+def test_export_arrow_round_trips(client, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = _history_rows()
+
+    response = client.get('/export?format=arrow')
+
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.column("fear_greed").to_pylist() == [61, 40]
+    assert table.schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+
+
+def test_export_parquet_round_trips(client, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = _history_rows()
+
+    response = client.get('/export?format=parquet')
+
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == "attachment;filename=sentiment_history.parquet"
+    table = pq.read_table(io.BytesIO(response.data))
+    assert table.num_rows == 2
+    assert table.schema == flask_app_module._arrow_schema(pa)
+    assert table.column("summary_text").to_pylist() == ["Up", "Down"]
+
+
+def test_export_head_request_releases_connection(client, mock_db_cursor):
+    mock_db_cursor.fetchall.return_value = _history_rows()
+
+    with client.head('/export?format=ndjson') as response:
+        assert response.status_code == 200
+    mock_db_cursor.close.assert_called_once()
+    flask_app_module.get_db_connection().close.assert_called_once()
+
+
+def test_choose_history_bucket_scales_with_range():
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    assert flask_app_module.choose_history_bucket(start, start + timedelta(hours=12)) is None
+    assert flask_app_module.choose_history_bucket(start, start + timedelta(days=5)) == "hour"
+    assert flask_app_module.choose_history_bucket(start, start + timedelta(days=90)) == "day"
+    assert flask_app_module.choose_history_bucket(start, start + timedelta(days=3 * 365)) == "week"
+    assert flask_app_module.choose_history_bucket(None, start) is None
+
+
+def test_long_date_range_charts_daily_buckets(client, mock_db_cursor):
+    latest = {"id": 9, "fear_greed": 50, "vix": 20.0, "summary_text": "x", "timestamp": datetime(2023, 3, 31, 12, 0)}
+    span = {"first": datetime(2023, 1, 1, tzinfo=timezone.utc), "last": datetime(2023, 3, 31, tzinfo=timezone.utc)}
+    mock_db_cursor.fetchone.side_effect = [latest, span]
+    buckets = [
+        {"bucket": datetime(2023, 1, 1), "samples": 50, "fg_avg": Decimal("41.25"), "fg_min": 30, "fg_max": 55,
+         "vix_avg": Decimal("21.125"), "vix_min": Decimal("19.5"), "vix_max": Decimal("23")},
+        {"bucket": datetime(2023, 1, 2), "samples": 48, "fg_avg": Decimal("60"), "fg_min": 58, "fg_max": 62,
+         "vix_avg": None, "vix_min": None, "vix_max": None},
+    ]
+    mock_db_cursor.fetchall.side_effect = [[latest], buckets]
+
+    data = flask_app_module.get_sentiment_data_from_db(start_date_str="2023-01-01", end_date_str="2023-03-31")
+
+    chart = data["chart_data"]
+    assert chart["bucket"] == "day"
+    assert chart["timestamps"] == ["2023-01-01", "2023-01-02"]
+    assert chart["fg_values"] == [41.2, 60.0] and chart["fg_min"] == [30, 58]
+    assert chart["vix_values"] == [21.12, None]
+    sql, params = mock_db_cursor.execute.call_args.args
+    assert "date_trunc(%s" in sql and params[0] == "day" and len(params) == 3
+    assert "FROM sentiment_rollup_daily WHERE bucket >= %s AND bucket <= %s" in sql
+    # The table still lists the most recent raw rows.
+    assert [row["id"] for row in data["history_table"]] == [9]
+
+
+def test_backfill_rollups_command_rebuilds_both_tables(runner, mock_db_cursor):
+    mock_db_cursor.rowcount = 3
+
+    result = runner.invoke(args=["backfill-rollups", "--since", "2023-01-01"])
+
+    assert result.exit_code == 0, result.output
+    assert "sentiment_rollup_hourly: 3 buckets written" in result.output
+    statements = [c.args for c in mock_db_cursor.execute.call_args_list]
+    assert statements[0][0].startswith("LOCK TABLE sentiment_history")
+    assert [params[0] for _, params in statements[1:]] == ["hour", "day"]
+    assert all(params[1] == datetime(2023, 1, 1, tzinfo=timezone.utc) for _, params in statements[1:])
+    flask_app_module.get_db_connection().commit.assert_called_once()
+
+
+def test_backfill_rollups_command_rejects_bad_date(runner, mock_db_cursor):
+    result = runner.invoke(args=["backfill-rollups", "--since", "yesterday"])
+    assert result.exit_code != 0
+    mock_db_cursor.execute.assert_not_called()
+
+
+def test_api_history_page_uses_keyset_cursor(client, mock_db_cursor):
+    rows = [{"id": 10 - i, "fear_greed": 50, "vix": 15.0, "summary_text": "s", "timestamp": datetime(2023, 1, 1, 12 - i, tzinfo=timezone.utc)}
+            for i in range(3)]
+    mock_db_cursor.fetchall.return_value = rows
+
+    first = client.get('/api/history/page?limit=2').get_json()
+    assert [item["id"] for item in first["items"]] == [10, 9]
+    assert mock_db_cursor.execute.call_args.args[1] == (3,)
+
+    mock_db_cursor.fetchall.return_value = rows[2:]
+    second = client.get(f'/api/history/page?limit=2&cursor={first["next_cursor"]}').get_json()
+    assert [item["id"] for item in second["items"]] == [8]
+    assert second["next_cursor"] is None
+    sql, params = mock_db_cursor.execute.call_args.args
+    assert "(timestamp, id) < (%s, %s)" in sql and "OFFSET" not in sql
+    assert params == (rows[1]["timestamp"], rows[1]["timestamp"], 9, 3)
+
+
+def test_history_pages_do_not_repeat_rows_with_tied_timestamps(mock_db_cursor):
+    tied = datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+    # Heap order as the database might return it, not sorted by id.
+    stored = [{"id": row_id, "fear_greed": 50, "vix": 15.0, "summary_text": "s", "timestamp": tied} for row_id in (4, 6, 5, 3)]
+
+    def execute(sql, params=()):
+        rows = stored
+        if "(timestamp, id) < (%s, %s)" in sql:
+            rows = [r for r in rows if (r["timestamp"], r["id"]) < (params[1], params[2])]
+        key = (lambda r: (r["timestamp"], r["id"])) if "timestamp DESC, id DESC" in sql else (lambda r: r["timestamp"])
+        limit = params[-1] if "LIMIT %s" in sql else None
+        mock_db_cursor.fetchall.return_value = sorted(rows, key=key, reverse=True)[:limit]
+    mock_db_cursor.execute.side_effect = execute
+    mock_db_cursor.fetchone.return_value = stored[0]
+
+    first = flask_app_module.get_sentiment_data_from_db(limit_display=2, limit_chart=10)
+    second = flask_app_module.get_history_page(first["history_next_cursor"], limit=2)
+
+    ids = [r["id"] for r in first["history_table"] + second["rows"]]
+    assert ids == [6, 5, 4, 3]
+
+
+def test_api_history_page_rejects_bad_cursor(client, mock_db_cursor):
+    assert client.get('/api/history/page?cursor=not-a-cursor').status_code == 400
+    mock_db_cursor.execute.assert_not_called()
+
+
+def test_index_pages_history_table_with_cursor(client, mock_db_cursor):
+    older = {"id": 3, "fear_greed": 20, "vix": 30.0, "summary_text": "s", "timestamp": datetime(2022, 6, 1, 8, 0, tzinfo=timezone.utc)}
+    mock_db_cursor.fetchone.return_value = None
+    mock_db_cursor.fetchall.return_value = [older]
+    cursor = flask_app_module.encode_history_cursor({"id": 4, "timestamp": datetime(2022, 6, 2, tzinfo=timezone.utc)})
+
+    html = client.get(f'/?cursor={cursor}').data.decode('utf-8')
+
+    assert '2022-06-01 08:00' in html
+    assert 'Newest' in html and 'Older' not in html
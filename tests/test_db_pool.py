@@ -0,0 +1,63 @@
+import threading
+import time
+
+import psycopg2.extensions
+import pytest
+
+from website.db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def test_pool_reuses_connections_and_reports_utilization():
+    opened = []
+    pool = ConnectionPool(lambda: opened.append(FakeConnection()) or opened[-1], minconn=1, maxconn=2)
+
+    first = pool.getconn()
+    assert first is opened[0] and pool.owns(first)
+    assert pool.stats()["utilization"] == 0.5
+    first.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    pool.putconn(first)
+
+    assert pool.getconn() is first and first.rollbacks == 1
+    assert len(opened) == 1
+
+
+def test_pool_waits_for_release_then_times_out():
+    pool = ConnectionPool(FakeConnection, minconn=0, maxconn=1, acquire_timeout=0.1)
+    held = pool.getconn()
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+    threading.Timer(0.05, pool.putconn, args=(held,)).start()
+    started = time.monotonic()
+    assert pool.getconn(timeout=1) is held
+    assert time.monotonic() - started < 0.5
+
+
+def test_pool_replaces_broken_connection_on_checkout():
+    pool = ConnectionPool(FakeConnection, minconn=1, maxconn=1)
+    broken = pool.getconn()
+    pool.putconn(broken)
+    broken.closed = 2
+
+    fresh = pool.getconn()
+    assert fresh is not broken
+    assert pool.stats()["size"] == 1
@@ -0,0 +1,66 @@
+"""Startup benchmark: each pipeline script must import without pulling in
+heavy optional dependencies and within an import-time budget measured with
+`python -X importtime`. Budgets are relative to a baseline import in the
+same interpreter, so they hold on slow or loaded machines; IMPORT_BUDGET_SCALE
+loosens them further if needed."""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = ("yfinance", "pandas", "bs4", "feedparser", "azure.ai.inference")
+# Budgets are multiples of the time to import BASELINE_MODULE right after
+# the script in the same process. asyncio is a sizeable, pure-stdlib package
+# none of the scripts import (about a sixth of webScrape's cost today);
+# pulling in pandas alone would blow every budget.
+BASELINE_MODULE = "asyncio"
+IMPORT_BUDGETS = {
+    "website.crucialPys.webScrape": 12,
+    "website.crucialPys.analyze_news": 12,
+    "website.crucialPys.alert_monitor": 12,
+}
+IMPORT_BUDGET_SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+
+def _run_python(*args):
+    env = dict(os.environ, LOG_LEVEL="WARNING")
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=PROJECT_ROOT, env=env, timeout=120)
+
+
+def _cumulative_import_seconds(*module_names):
+    """Cumulative import time of each module, imported in order in one
+    fresh interpreter."""
+    result = _run_python("-X", "importtime", "-c", "; ".join(f"import {name}" for name in module_names))
+    assert result.returncode == 0, result.stderr
+    seconds = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)\s*$", line)
+        if match and match.group(2) in module_names:
+            seconds[match.group(2)] = int(match.group(1)) / 1_000_000
+    missing = [name for name in module_names if name not in seconds]
+    assert not missing, f"{missing} not freshly imported (already pulled in by an earlier module?)"
+    return [seconds[name] for name in module_names]
+
+
+@pytest.mark.parametrize("module_name", sorted(IMPORT_BUDGETS))
+def test_script_import_skips_heavy_dependencies(module_name):
+    result = _run_python("-c", f"import sys, {module_name}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize("module_name", sorted(IMPORT_BUDGETS))
+def test_script_import_time_within_budget(module_name):
+    budget = IMPORT_BUDGETS[module_name] * IMPORT_BUDGET_SCALE
+    # Best of three runs to keep the check stable on a noisy machine.
+    runs = [_cumulative_import_seconds(module_name, BASELINE_MODULE) for _ in range(3)]
+    elapsed, baseline = min(runs, key=lambda run: run[0] / run[1])
+    assert elapsed <= budget * baseline, (
+        f"{module_name} imported in {elapsed:.3f}s, {elapsed / baseline:.1f}x {BASELINE_MODULE} "
+        f"(budget {budget:.1f}x = {budget * baseline:.3f}s)"
+    )
@@ -0,0 +1,26 @@
+from website.crucialPys import lexicon_sentiment
+
+
+def test_score_articles_signs_and_neutral_default():
+    articles = [
+        {"title": "Stocks surge to record as rally broadens", "summary": ""},
+        {"title": "Markets crash amid recession fears", "summary": "Panic selling"},
+        {"title": "Company holds annual meeting", "summary": "N/A"},
+    ]
+    scores, hits = lexicon_sentiment.score_articles(articles)
+
+    assert scores[0] > 0.5 and scores[1] < -0.5
+    assert scores[2] == 0 and hits[2] == 0
+    assert lexicon_sentiment.fear_greed_index(scores[2:], hits[2:]) == 50
+
+
+def test_rank_articles_orders_by_strength_and_limits():
+    articles = [{"title": "Quiet session"}, {"title": "Stocks edge higher"}, {"title": "Banks plunge in market meltdown"}]
+    ranked = lexicon_sentiment.rank_articles(articles, limit=2)
+    assert [a["title"] for a in ranked] == ["Banks plunge in market meltdown", "Stocks edge higher"]
+
+
+def test_analyze_aggregates_index_and_counts():
+    result = lexicon_sentiment.analyze([{"title": "Shares soar"}, {"title": "Shares soar again"}, {"title": "Stocks slip"}])
+    assert result["fear_greed"] > 50
+    assert (result["positive"], result["negative"], result["scored"]) == (2, 1, 3)
@@ -0,0 +1,126 @@
+import multiprocessing
+import time
+
+import pytest
+
+import scheduler_main
+
+
+@pytest.fixture
+def job_script(tmp_path, mocker):
+    """A script path run_script accepts, with no in-process entry point yet."""
+    path = tmp_path / "job.py"
+    path.write_text("import sys\nsys.exit(0)\n")
+    mocker.patch.dict(scheduler_main._job_functions, clear=True)
+    mocker.patch.dict(scheduler_main._running_threads, clear=True)
+    return str(path)
+
+
+def _succeed():
+    pass
+
+
+def _raise():
+    raise RuntimeError("boom")
+
+
+def _hang():
+    time.sleep(60)
+
+
+def test_run_script_selects_run_mode(job_script, mocker):
+    runners = {
+        "fork": mocker.patch.object(scheduler_main, "_run_forked", return_value=True),
+        "thread": mocker.patch.object(scheduler_main, "_run_threaded", return_value=True),
+        "subprocess": mocker.patch.object(scheduler_main, "_run_subprocess", return_value=True),
+    }
+
+    def called_mode():
+        modes = [mode for mode, runner in runners.items() if runner.called]
+        for runner in runners.values():
+            runner.reset_mock()
+        return modes
+
+    # No imported entry point: one fresh interpreter per run.
+    assert scheduler_main.run_script(job_script) is True
+    assert called_mode() == ["subprocess"]
+
+    scheduler_main._job_functions[job_script] = _succeed
+    mocker.patch.object(scheduler_main.multiprocessing, "get_all_start_methods", return_value=["fork", "spawn"])
+    scheduler_main.run_script(job_script)
+    assert called_mode() == ["fork"]
+
+    scheduler_main.multiprocessing.get_all_start_methods.return_value = ["spawn"]
+    scheduler_main.run_script(job_script)
+    assert called_mode() == ["thread"]
+
+
+def test_run_script_reports_missing_script(tmp_path):
+    assert scheduler_main.run_script(str(tmp_path / "missing.py")) is False
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+@pytest.mark.parametrize("func, expected", [(_succeed, True), (_raise, False)])
+def test_forked_job_outcome(job_script, func, expected):
+    scheduler_main._job_functions[job_script] = func
+    assert scheduler_main.run_script(job_script) is expected
+
+
+@pytest.mark.parametrize("func, expected", [(_succeed, True), (_raise, False)])
+def test_threaded_job_outcome(job_script, mocker, func, expected):
+    scheduler_main._job_functions[job_script] = func
+    mocker.patch.object(scheduler_main.multiprocessing, "get_all_start_methods", return_value=["spawn"])
+    assert scheduler_main.run_script(job_script) is expected
+
+
+@pytest.mark.parametrize("exit_code, expected", [(0, True), (1, False)])
+def test_subprocess_job_outcome(job_script, tmp_path, exit_code, expected):
+    script = tmp_path / "exits.py"
+    script.write_text(f"import sys\nsys.exit({exit_code})\n")
+    assert scheduler_main.run_script(str(script)) is expected
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_job_is_killed_on_timeout(job_script, mocker):
+    mocker.patch.object(scheduler_main, "SCRIPT_TIMEOUT_SECONDS", 0.5)
+    scheduler_main._job_functions[job_script] = _hang
+
+    started = time.monotonic()
+    assert scheduler_main.run_script(job_script) is False
+    assert time.monotonic() - started < 10
+    assert multiprocessing.active_children() == []
+
+
+def test_subprocess_job_is_killed_on_timeout(job_script, tmp_path, mocker):
+    mocker.patch.object(scheduler_main, "SCRIPT_TIMEOUT_SECONDS", 0.5)
+    script = tmp_path / "hangs.py"
+    script.write_text("import time\ntime.sleep(60)\n")
+
+    started = time.monotonic()
+    assert scheduler_main.run_script(str(script)) is False
+    assert time.monotonic() - started < 10
+
+
+def test_threaded_job_timeout_fails_and_blocks_overlapping_run(job_script, mocker):
+    mocker.patch.object(scheduler_main, "SCRIPT_TIMEOUT_SECONDS", 0.2)
+    mocker.patch.object(scheduler_main.multiprocessing, "get_all_start_methods", return_value=["spawn"])
+    release = scheduler_main.threading.Event()
+    calls = []
+    scheduler_main._job_functions[job_script] = lambda: calls.append(1) or release.wait(10)
+
+    try:
+        assert scheduler_main.run_script(job_script) is False
+        # Threads cannot be killed, so the hung run must not be started again.
+        assert scheduler_main.run_script(job_script) is False
+        assert calls == [1]
+    finally:
+        release.set()
+
+
+def test_combined_pipeline_skips_analysis_when_scrape_fails(mocker):
+    mocker.patch.object(scheduler_main, "job_run_webscrape", return_value=False)
+    analyze = mocker.patch.object(scheduler_main, "job_run_analyze_news")
+
+    scheduler_main.combined_pipeline_job()
+
+    analyze.assert_not_called()
@@ -1,7 +1,12 @@
-import requests
+import json
+import threading
 import time
-from datetime import datetime, timezone
-from website.crucialPys import webScrape
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from website.crucialPys import http_client, webScrape
 
 SAMPLE_HTML_SUMMARY = "<p>This is a <b>test</b> summary. & some entities.</p> "
 EXPECTED_CLEAN_SUMMARY = "This is a test summary. & some entities."
@@ -35,29 +40,57 @@ def test_format_timestamp_various_inputs():
     assert webScrape.format_timestamp("invalid-date-string") is None
     assert webScrape.format_timestamp(None) is None
 
-def test_fetch_url_with_retry_success(mocker):
+def test_fetch_url_with_retry_success(mocker, monkeypatch):
     mock_response = mocker.Mock()
     mock_response.status_code = 200
     mock_response.content = b"Test content"
     mock_response.raise_for_status = mocker.Mock()
 
-    mocker.patch('requests.get', return_value=mock_response)
-    webScrape.REQUESTS_AVAILABLE = True
-    
+    session = http_client.get_session()
+    mocker.patch.object(session, 'request', return_value=mock_response)
+    monkeypatch.setattr(webScrape, "REQUESTS_AVAILABLE", True)
+
     content = webScrape.fetch_url_with_retry("http://example.com")
-    
+
     assert content == b"Test content"
-    requests.get.assert_called_once_with("http://example.com", headers=None, timeout=webScrape.REQUEST_TIMEOUT)
+    session.request.assert_called_once_with("GET", "http://example.com", headers=None, timeout=webScrape.REQUEST_TIMEOUT)
 
-def test_fetch_url_with_retry_failure(mocker):
-    mocker.patch('requests.get', side_effect=requests.exceptions.RequestException("Test error"))
-    mocker.patch('time.sleep', return_value=None)
-    webScrape.REQUESTS_AVAILABLE = True
+def test_fetch_url_with_retry_failure(mocker, monkeypatch):
+    session = http_client.get_session()
+    mocker.patch.object(session, 'request', side_effect=requests.exceptions.RequestException("Test error"))
+    sleep_mock = mocker.patch('time.sleep', return_value=None)
+    monkeypatch.setattr(webScrape, "REQUESTS_AVAILABLE", True)
 
     content = webScrape.fetch_url_with_retry("http://example.com")
 
     assert content is None
-    assert requests.get.call_count == webScrape.MAX_RETRIES
+    assert session.request.call_count == webScrape.MAX_RETRIES
+    # Backoff grows between attempts instead of sleeping a fixed delay.
+    delays = [call.args[0] for call in sleep_mock.call_args_list]
+    assert len(delays) == webScrape.MAX_RETRIES - 1
+    assert delays == sorted(delays)
+
+
+def test_backoff_delay_is_exponential_with_bounded_jitter(mocker):
+    mocker.patch.object(http_client, "HTTP_BACKOFF_BASE", 1.0)
+    mocker.patch.object(http_client, "HTTP_BACKOFF_MAX", 5.0)
+    mocker.patch.object(http_client, "HTTP_BACKOFF_JITTER", 0.5)
+    for attempt, base in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)]:
+        delay = http_client.backoff_delay(attempt)
+        assert base <= delay <= base * 1.5
+
+
+def test_pool_stats_counts_reused_connections(mocker):
+    session = http_client.get_session()
+    pool = mocker.Mock(scheme="https", host="example.com", port=443, num_requests=5, num_connections=2)
+    pools = mocker.Mock()
+    pools.keys.return_value = ["k"]
+    pools.get.return_value = pool
+    adapter = mocker.Mock()
+    adapter.poolmanager.pools = pools
+    mocker.patch.object(session, "adapters", {"https://": adapter, "http://": adapter})
+
+    assert http_client.pool_stats() == {"https://example.com:443": {"requests": 5, "new_connections": 2}}
 
 
 def test_normalize_yfinance_item_legacy_format():
@@ -94,3 +127,219 @@ def test_normalize_yfinance_item_new_format():
 def test_normalize_yfinance_item_missing_link_returns_none():
     assert webScrape._normalize_yfinance_item({"title": "No link"}) is None
     assert webScrape._normalize_yfinance_item({"content": {"title": "No link"}}) is None
+
+
+@pytest.fixture(autouse=True)
+def isolated_rss_cache(tmp_path, monkeypatch):
+    # Never read or write the real website/data_files cache from tests.
+    monkeypatch.setattr(webScrape, "RSS_CACHE_PATH", str(tmp_path / "rss_cache.json"))
+    monkeypatch.setattr(webScrape, "VIX_STATS_PATH", str(tmp_path / "vix_source_stats.json"))
+    monkeypatch.setattr(webScrape, "VIX_QUOTE_PATH", str(tmp_path / "vix_quote.json"))
+
+
+def _rss_document(*links):
+    items = "".join(f"<item><title>{link}</title><link>{link}</link></item>" for link in links)
+    return f"<rss version='2.0'><channel><title>t</title>{items}</channel></rss>".encode()
+
+
+def _feed_response(mocker, content, status_code=200, headers=None):
+    response = mocker.Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+def test_get_rss_news_concurrent_keeps_feed_order_and_dedup(mocker, monkeypatch):
+    feeds = [("Feed A", "http://a.example/rss"), ("Feed B", "http://b.example/rss"), ("Feed C", "http://c.example/rss")]
+    responses = {
+        "http://a.example/rss": _feed_response(mocker, _rss_document("https://x/1", "https://x/2")),
+        "http://b.example/rss": _feed_response(mocker, _rss_document("https://x/2", "https://x/3")),
+        "http://c.example/rss": None,
+    }
+
+    def fake_get(url, headers=None):
+        # Finish the first feed last to prove results are merged in list order.
+        if url == "http://a.example/rss":
+            time.sleep(0.05)
+        return responses[url]
+
+    mocker.patch.object(webScrape, "ALL_RSS_FEEDS", feeds)
+    mocker.patch.object(webScrape, "_get_with_retry", side_effect=fake_get)
+    monkeypatch.setattr(webScrape, "REQUESTS_AVAILABLE", True)
+
+    articles = webScrape.get_rss_news(max_workers=3)
+
+    assert [a["url"] for a in articles] == ["https://x/1", "https://x/2", "https://x/3"]
+    assert articles[1]["source_name"] == "RSS (Feed A)"
+    assert articles[2]["source_name"] == "RSS (Feed B)"
+
+
+def test_get_rss_news_reuses_cached_articles_on_304(mocker, monkeypatch):
+    url = "http://a.example/rss"
+    mocker.patch.object(webScrape, "ALL_RSS_FEEDS", [("Feed A", url)])
+    monkeypatch.setattr(webScrape, "REQUESTS_AVAILABLE", True)
+    fresh = _feed_response(mocker, _rss_document("https://x/1"), headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    get_mock = mocker.patch.object(webScrape, "_get_with_retry", return_value=fresh)
+
+    first = webScrape.get_rss_news()
+
+    get_mock.return_value = _feed_response(mocker, b"", status_code=304)
+    parse_spy = mocker.spy(webScrape, "_parse_feed_articles")
+    second = webScrape.get_rss_news()
+
+    sent_headers = get_mock.call_args.kwargs["headers"]
+    assert sent_headers["If-None-Match"] == '"v1"'
+    assert sent_headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert parse_spy.call_count == 0
+    assert second == first
+
+
+def test_get_rss_news_prunes_cache_entries_for_removed_feeds(mocker, monkeypatch):
+    monkeypatch.setattr(webScrape, "REQUESTS_AVAILABLE", True)
+    webScrape.save_rss_cache({"http://gone.example/rss": {"etag": '"old"', "articles": []}})
+    mocker.patch.object(webScrape, "ALL_RSS_FEEDS", [("Feed A", "http://a.example/rss")])
+    mocker.patch.object(webScrape, "_get_with_retry", return_value=_feed_response(mocker, _rss_document("https://x/1")))
+
+    webScrape.get_rss_news()
+
+    assert list(webScrape.load_rss_cache()) == ["http://a.example/rss"]
+
+
+def test_get_yfinance_news_parallel_merges_in_ticker_order(mocker):
+    news_by_symbol = {
+        "AAA": [{"title": "a1", "link": "https://y/1"}, {"title": "a2", "link": "https://y/2"}],
+        "BBB": [{"title": "b1", "link": "https://y/2"}, {"title": "b2", "link": "https://y/3"}],
+        "SLOW": [{"title": "s1", "link": "https://y/4"}],
+    }
+
+    def fake_search(symbol, **kwargs):
+        if symbol == "SLOW":
+            time.sleep(0.5)
+        elif symbol == "AAA":
+            time.sleep(0.05)
+        return mocker.Mock(news=news_by_symbol[symbol])
+
+    search = mocker.Mock(side_effect=fake_search)
+    mocker.patch.object(webScrape, "YFINANCE_AVAILABLE", True)
+    mocker.patch.object(webScrape, "YF_REQUEST_TIMEOUT", 7)
+    mocker.patch.object(webScrape, "yf", mocker.Mock(Search=search), create=True)
+
+    articles = webScrape.get_yfinance_news(["AAA", "BBB", "SLOW"], max_workers=3, ticker_timeout=0.2)
+
+    # SLOW exceeds its timeout and is dropped; the shared URL is kept once.
+    assert [a["url"] for a in articles] == ["https://y/1", "https://y/2", "https://y/3"]
+    # Every lookup carries its own HTTP timeout.
+    assert {call.kwargs["timeout"] for call in search.call_args_list} == {7}
+
+
+def test_get_yfinance_news_hanging_ticker_does_not_block_others(mocker):
+    release = threading.Event()
+
+    def fake_search(symbol, **kwargs):
+        if symbol == "HANG":
+            release.wait(10)
+        return mocker.Mock(news=[{"title": symbol, "link": f"https://y/{symbol}"}])
+
+    mocker.patch.object(webScrape, "YFINANCE_AVAILABLE", True)
+    mocker.patch.object(webScrape, "yf", mocker.Mock(Search=mocker.Mock(side_effect=fake_search)), create=True)
+
+    started = time.monotonic()
+    try:
+        articles = webScrape.get_yfinance_news(["HANG", "AAA", "BBB"], max_workers=2, ticker_timeout=0.3)
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 1.5
+    assert [a["url"] for a in articles] == ["https://y/AAA", "https://y/BBB"]
+
+
+def test_order_vix_sources_prefers_fast_healthy_sources():
+    sources = [("a", None), ("b", None), ("c", None), ("d", None)]
+    stats = {
+        "a": {"attempts": 10, "success_rate": 0.1, "latency_ewma": 0.1},  # unhealthy
+        "b": {"attempts": 10, "success_rate": 0.9, "latency_ewma": 3.0},
+        "c": {"attempts": 10, "success_rate": 1.0, "latency_ewma": 0.5},
+    }
+    assert [name for name, _ in webScrape.order_vix_sources(sources, stats)] == ["c", "b", "d", "a"]
+
+
+def test_get_vix_value_hedges_slow_source_and_records_stats(mocker):
+    def slow():
+        time.sleep(1.0)
+        return 30.0
+
+    def broken():
+        raise ValueError("bad payload")
+
+    mocker.patch.object(webScrape, "_available_vix_sources", return_value=[("slow", slow), ("broken", broken), ("fast", lambda: 17.25)])
+
+    started = time.monotonic()
+    assert webScrape.get_vix_value(hedge_delay=0.05, timeout=5) == 17.25
+    assert time.monotonic() - started < 0.9
+
+    stats = webScrape.load_vix_stats()
+    assert stats["fast"]["successes"] == 1
+    assert stats["broken"]["attempts"] == 1 and stats["broken"]["successes"] == 0
+    assert "slow" not in stats
+
+
+def test_get_vix_value_gives_up_when_all_sources_exceed_timeout(mocker):
+    def slow():
+        time.sleep(3)
+        return 30.0
+
+    mocker.patch.object(webScrape, "_available_vix_sources", return_value=[("a", slow), ("b", slow)])
+
+    started = time.monotonic()
+    assert webScrape.get_vix_value(max_age=0, hedge_delay=0.2, timeout=1) is None
+    assert time.monotonic() - started < 2
+
+
+def test_get_vix_value_all_sources_fail(mocker):
+    mocker.patch.object(webScrape, "_available_vix_sources", return_value=[("a", lambda: None), ("b", lambda: 0.0)])
+    assert webScrape.get_vix_value(hedge_delay=1, timeout=5) is None
+
+
+def test_get_vix_quote_reuses_fresh_cached_quote(mocker):
+    resolve = mocker.patch.object(webScrape, "_resolve_vix", return_value=(21.5, "cnbc"))
+
+    first = webScrape.get_vix_quote(max_age=60)
+    second = webScrape.get_vix_quote(max_age=60)
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["vix"] == 21.5 and second["source"] == "cnbc"
+    resolve.assert_called_once()
+
+    # An expired quote is refreshed from the sources.
+    assert webScrape.get_vix_value(max_age=0) == 21.5
+    assert resolve.call_count == 2
+
+
+@pytest.mark.parametrize("timestamp, expected", [
+    (lambda now: now.replace(tzinfo=None).isoformat(), 19.0),  # naive, read as UTC
+    (lambda now: now.astimezone(timezone(timedelta(hours=2))).isoformat(), 19.0),
+    (lambda now: "yesterday", None),
+    (lambda now: 1700000000, None),
+])
+def test_load_vix_quote_normalizes_or_rejects_timestamps(timestamp, expected):
+    now = datetime.now(timezone.utc) - timedelta(seconds=5)
+    webScrape.save_vix_quote({"vix": 19.0, "source": "cnbc", "timestamp_utc": timestamp(now)})
+
+    quote = webScrape.load_vix_quote(max_age=60)
+
+    assert (quote["vix"] if quote else None) == expected
+
+
+def test_main_reports_cached_vix_quote_time(tmp_path, mocker):
+    mocker.patch.object(webScrape, "OUTPUT_DIR", str(tmp_path))
+    mocker.patch.object(webScrape, "get_rss_news", return_value=[])
+    mocker.patch.object(webScrape, "get_yfinance_news", return_value=[])
+    mocker.patch.object(webScrape, "get_vix_quote", return_value={
+        "vix": 18.2, "source": "cnbc", "timestamp_utc": "2024-01-01T12:00:00Z", "cached": True})
+
+    webScrape.main()
+
+    with open(tmp_path / webScrape.OUTPUT_FILENAME, encoding="utf-8") as f:
+        vix_data = json.load(f)["vix_data"]
+    assert vix_data == {"vix": 18.2, "source": "cnbc", "timestamp_utc": "2024-01-01T12:00:00Z"}
@@ -1,6 +1,10 @@
 import csv
+import base64
 import datetime
+import hashlib
+import importlib.util
 import io
+import itertools
 import json
 import logging
 import os
@@ -8,8 +12,12 @@ import secrets
 import subprocess
 import sys
 import threading
+import time
+import zlib
+from collections import OrderedDict
 from datetime import timezone
 
+import click
 import psycopg2
 from dotenv import load_dotenv
 from flask import Flask, Response, flash, jsonify, redirect, render_template, request, url_for
@@ -18,6 +26,18 @@ from psycopg2.extras import RealDictCursor
 from wtforms import FloatField, StringField, SubmitField
 from wtforms.validators import DataRequired, Email, NumberRange
 
+# Allow running this file directly (python website/appFlask.py) as well as
+# importing it as website.appFlask.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from website.db_pool import ConnectionPool, PoolTimeout  # noqa: E402
+
+# Optional: Arrow IPC and Parquet exports. Imported on first use so app
+# start-up does not pay for it.
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
 load_dotenv()
 
 if not logging.getLogger().handlers:
@@ -62,9 +82,41 @@ DB_NAME = os.environ.get("DB_NAME", "marketsentiment")
 DB_USER = os.environ.get("DB_USER", "user")
 DB_PASS = os.environ.get("DB_PASS", "password")
 DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+# Per-worker connection pool: connections opened up front / hard cap, how
+# long a request waits for a free connection, and how long a connection may
+# sit idle before it is re-validated with SELECT 1 on checkout.
+DB_POOL_MIN = int(os.environ.get("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+DB_POOL_HEALTHCHECK_INTERVAL = float(os.environ.get("DB_POOL_HEALTHCHECK_INTERVAL", "30"))
 
 MAX_HISTORY_RECORDS_DISPLAY = 15
 MAX_HISTORY_RECORDS_CHART = 50
+HISTORY_PAGE_MAX_LIMIT = 100
+# Date-filtered ranges longer than this are charted from date_trunc
+# buckets (hour/day/week/month, finest that fits CHART_POINT_BUDGET points)
+# instead of the most recent MAX_HISTORY_RECORDS_CHART raw rows.
+HISTORY_RAW_MAX_SPAN_HOURS = int(os.environ.get("HISTORY_RAW_MAX_SPAN_HOURS", "24"))
+CHART_POINT_BUDGET = int(os.environ.get("CHART_POINT_BUDGET", "200"))
+# Bucketed charts read the rollup tables that analyze_news maintains on
+# every insert (see backfill-rollups) instead of scanning sentiment_history.
+HISTORY_USE_ROLLUPS = os.environ.get("HISTORY_USE_ROLLUPS", "1") == "1"
+ROLLUP_TABLES = {"hour": "sentiment_rollup_hourly", "day": "sentiment_rollup_daily"}
+HISTORY_BUCKETS = (
+    ("hour", datetime.timedelta(hours=1)),
+    ("day", datetime.timedelta(days=1)),
+    ("week", datetime.timedelta(weeks=1)),
+    ("month", datetime.timedelta(days=31)),
+)
+# Per-worker cache of the dashboard payload (0 disables). Entries are also
+# invalidated whenever latest_indices.json changes; the TTL only bounds
+# staleness from database writes that bypass analyze_news.
+DASHBOARD_CACHE_TTL_SECONDS = int(os.environ.get("DASHBOARD_CACHE_TTL_SECONDS", "1800"))
+DASHBOARD_CACHE_MAX_ENTRIES = 32
+# Cache-Control max-age for the JSON API; clients revalidate with the ETag.
+API_MAX_AGE_SECONDS = int(os.environ.get("API_MAX_AGE_SECONDS", "60"))
+# Rows fetched per round-trip by the streaming exports' server-side cursor.
+EXPORT_ITERSIZE = int(os.environ.get("EXPORT_ITERSIZE", "2000"))
 SCRIPT_TIMEOUT_SECONDS = int(os.environ.get("SCRIPT_TIMEOUT_SECONDS", "900"))
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -78,24 +130,213 @@ AI_CONFIG_PATH = os.path.join(PROJECT_ROOT, "website", "data_files", "ai_config.
 # Prevents concurrent pipeline runs triggered from the dashboard buttons.
 _script_lock = threading.Lock()
 
+# Processed dashboard payloads keyed by (start_date, end_date), least
+# recently used first: (latest_indices.json mtime, cached at, payload).
+_dashboard_cache = OrderedDict()
+_dashboard_cache_lock = threading.Lock()
+
+
+# Prevents concurrent pool creation; the pool is per process, so a gunicorn
+# worker forked after init_db builds its own instead of sharing sockets.
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+def _connect():
+    return psycopg2.connect(
+        host=DB_HOST,
+        database=DB_NAME,
+        user=DB_USER,
+        password=DB_PASS,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+    )
+
+
+def get_db_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(
+                    _connect, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+                    acquire_timeout=DB_POOL_TIMEOUT, healthcheck_interval=DB_POOL_HEALTHCHECK_INTERVAL,
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
 
 def get_db_connection():
+    """Check out a pooled connection, or return None when the database is
+    unavailable. Hand it back with release_db_connection."""
     if not all([DB_NAME, DB_USER, DB_PASS]):
         logger.warning("Database credentials are not fully configured.")
         return None
     try:
-        return psycopg2.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASS,
-            connect_timeout=DB_CONNECT_TIMEOUT,
-        )
+        return get_db_pool().getconn()
+    except PoolTimeout as error:
+        logger.error("Database pool exhausted: %s", error)
+        return None
     except psycopg2.Error as error:
         logger.error("Database connection failed: %s", error)
         return None
 
 
+def release_db_connection(conn):
+    """Return a connection to the pool (closing it if it did not come from
+    the pool)."""
+    pool = _pool if _pool_pid == os.getpid() else None
+    if pool is not None and pool.owns(conn):
+        pool.putconn(conn)
+    else:
+        conn.close()
+
+
+def history_date_filter(start_date_str=None, end_date_str=None, column="timestamp"):
+    """SQL WHERE clause (with a leading space, or empty) and parameters for
+    the dashboard's inclusive start_date / end_date (YYYY-MM-DD, UTC)
+    filters on `column`. Invalid dates are ignored."""
+    query_params, conditions = [], []
+    if start_date_str:
+        try:
+            start_date_obj = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+            conditions.append(f"{column} >= %s")
+            query_params.append(start_date_obj)
+        except ValueError:
+            logger.warning("Ignoring invalid start_date filter: %r", start_date_str)
+    if end_date_str:
+        try:
+            end_date_obj = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=timezone.utc)
+            conditions.append(f"{column} <= %s")
+            query_params.append(end_date_obj)
+        except ValueError:
+            logger.warning("Ignoring invalid end_date filter: %r", end_date_str)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), query_params
+
+
+def choose_history_bucket(first, last):
+    """Bucket size for charting first..last: None (raw rows) for ranges up
+    to HISTORY_RAW_MAX_SPAN_HOURS, else the finest of hour/day/week/month
+    that keeps the chart within CHART_POINT_BUDGET points."""
+    if not isinstance(first, datetime.datetime) or not isinstance(last, datetime.datetime):
+        return None
+    span = last - first
+    if span <= datetime.timedelta(hours=HISTORY_RAW_MAX_SPAN_HOURS):
+        return None
+    for unit, width in HISTORY_BUCKETS:
+        if span / width < CHART_POINT_BUDGET:
+            return unit
+    return HISTORY_BUCKETS[-1][0]
+
+
+def get_bucketed_history(cur, bucket, start_date_str=None, end_date_str=None):
+    """Chart series aggregated per UTC date_trunc bucket: average Fear &
+    Greed and VIX plus their min/max, oldest bucket first. Read from the
+    hourly/daily rollup tables unless HISTORY_USE_ROLLUPS is off."""
+    if HISTORY_USE_ROLLUPS:
+        table = ROLLUP_TABLES["hour" if bucket == "hour" else "day"]
+        sql_where, query_params = history_date_filter(start_date_str, end_date_str, column="bucket")
+        cur.execute(
+            "SELECT date_trunc(%s, bucket, 'UTC') AT TIME ZONE 'UTC' AS bucket, sum(samples) AS samples,"
+            " sum(fg_sum) / NULLIF(sum(fg_count), 0) AS fg_avg, min(fg_min) AS fg_min, max(fg_max) AS fg_max,"
+            " sum(vix_sum) / NULLIF(sum(vix_count), 0) AS vix_avg, min(vix_min) AS vix_min, max(vix_max) AS vix_max"
+            f" FROM {table}{sql_where} GROUP BY 1 ORDER BY 1",
+            (bucket, *query_params),
+        )
+    else:
+        sql_where, query_params = history_date_filter(start_date_str, end_date_str)
+        cur.execute(
+            "SELECT date_trunc(%s, timestamp AT TIME ZONE 'UTC') AS bucket, count(*) AS samples,"
+            " avg(fear_greed) AS fg_avg, min(fear_greed) AS fg_min, max(fear_greed) AS fg_max,"
+            " avg(vix) AS vix_avg, min(vix) AS vix_min, max(vix) AS vix_max"
+            f" FROM sentiment_history{sql_where} GROUP BY 1 ORDER BY 1",
+            (bucket, *query_params),
+        )
+    label_format = '%Y-%m-%d %H:00' if bucket == "hour" else '%Y-%m-%d'
+
+    def number(value, digits):
+        return round(float(value), digits) if value is not None else None
+
+    series = {"bucket": bucket, "timestamps": [], "samples": [], "fg_values": [], "fg_min": [], "fg_max": [],
+              "vix_values": [], "vix_min": [], "vix_max": []}
+    for row in cur.fetchall():
+        series["timestamps"].append(row["bucket"].strftime(label_format))
+        series["samples"].append(row["samples"])
+        series["fg_values"].append(number(row["fg_avg"], 1))
+        series["fg_min"].append(row["fg_min"])
+        series["fg_max"].append(row["fg_max"])
+        series["vix_values"].append(number(row["vix_avg"], 2))
+        series["vix_min"].append(number(row["vix_min"], 2))
+        series["vix_max"].append(number(row["vix_max"], 2))
+    return series
+
+
+def _history_table_row(r_raw):
+    r_tbl = r_raw.copy()
+    ts_tbl = r_tbl.get("timestamp")
+    r_tbl["timestamp_display"] = ts_tbl.strftime('%Y-%m-%d %H:%M') if isinstance(ts_tbl, datetime.datetime) else "N/A"
+    r_tbl["fear_greed_display"] = r_tbl.get("fear_greed", "N/A")
+    try:
+        r_tbl["vix_display"] = f"{float(r_tbl.get('vix', 0.0)):.2f}" if r_tbl.get("vix") is not None else "N/A"
+    except (ValueError, TypeError):
+        r_tbl["vix_display"] = "N/A"
+    return r_tbl
+
+
+def encode_history_cursor(row):
+    """Opaque keyset cursor for the position just after `row`."""
+    ts = row.get("timestamp")
+    if not isinstance(ts, datetime.datetime) or row.get("id") is None:
+        return None
+    return base64.urlsafe_b64encode(f"{ts.isoformat()}|{row['id']}".encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(token):
+    """(timestamp, id) from encode_history_cursor; raises ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        ts_str, row_id = raw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(ts_str), int(row_id)
+    except (ValueError, UnicodeDecodeError) as error:
+        raise ValueError(f"invalid history cursor: {token!r}") from error
+
+
+def get_history_page(cursor=None, limit=MAX_HISTORY_RECORDS_DISPLAY, start_date_str=None, end_date_str=None):
+    """One page of history, newest first, starting after `cursor`. Keyset
+    pagination on (timestamp, id): each page is an index range scan from
+    the cursor, so deep pages cost the same as the first (unlike OFFSET).
+    Returns {"rows", "next_cursor"}, or None when the database is down.
+    Raises ValueError for a malformed cursor."""
+    after = decode_history_cursor(cursor) if cursor else None
+    sql_where, query_params = history_date_filter(start_date_str, end_date_str)
+    conditions = [sql_where[len(" WHERE "):]] if sql_where else []
+    if after:
+        # The plain timestamp bound lets the planner use the timestamp index;
+        # the row comparison breaks ties between equal timestamps.
+        conditions.append("timestamp <= %s AND (timestamp, id) < (%s, %s)")
+        query_params += [after[0], after[0], after[1]]
+    sql = "SELECT id, fear_greed, vix, summary_text, timestamp FROM sentiment_history"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY timestamp DESC, id DESC LIMIT %s"
+    query_params.append(limit + 1)
+
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(sql, tuple(query_params))
+            rows = cur.fetchall()
+    except psycopg2.Error as error:
+        logger.error("Failed to read history page: %s", error)
+        return None
+    finally:
+        release_db_connection(conn)
+    page = [_history_table_row(r) for r in rows[:limit]]
+    return {"rows": page, "next_cursor": encode_history_cursor(page[-1]) if len(rows) > limit else None}
+
+
 def get_sentiment_data_from_db(limit_display=MAX_HISTORY_RECORDS_DISPLAY, limit_chart=MAX_HISTORY_RECORDS_CHART, for_export=False, start_date_str=None, end_date_str=None):
     latest_data = {
         "fear_greed": 50, "vix": None, "timestamp": "N/A", "summary_text": "N/A",
@@ -117,12 +358,14 @@ def get_sentiment_data_from_db(limit_display=MAX_HISTORY_RECORDS_DISPLAY, limit_
             logger.warning("Could not read JSON cache %s: %s", LATEST_JSON_PATH, error)
 
     historical_data_raw, history_for_table, history_timestamps, history_fg_values, history_vix_values = [], [], [], [], []
+    chart_data_extra = {"bucket": None}
+    from_db = False
 
     conn = get_db_connection()
     if conn:
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT fear_greed, vix, summary_text, timestamp FROM sentiment_history ORDER BY timestamp DESC LIMIT 1")
+                cur.execute("SELECT id, fear_greed, vix, summary_text, timestamp FROM sentiment_history ORDER BY timestamp DESC LIMIT 1")
                 latest_row = cur.fetchone()
                 if latest_row:
                     latest_data.update(latest_row)
@@ -155,25 +398,10 @@ def get_sentiment_data_from_db(limit_display=MAX_HISTORY_RECORDS_DISPLAY, limit_
                 else:
                     latest_data["summary_text_display"] = raw_summary
 
-                query_params, conditions = [], []
                 sql_history_base = "SELECT id, fear_greed, vix, summary_text, timestamp FROM sentiment_history"
-                if start_date_str:
-                    try:
-                        start_date_obj = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
-                        conditions.append("timestamp >= %s")
-                        query_params.append(start_date_obj)
-                    except ValueError:
-                        logger.warning("Ignoring invalid start_date filter: %r", start_date_str)
-                if end_date_str:
-                    try:
-                        end_date_obj = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=timezone.utc)
-                        conditions.append("timestamp <= %s")
-                        query_params.append(end_date_obj)
-                    except ValueError:
-                        logger.warning("Ignoring invalid end_date filter: %r", end_date_str)
-
-                sql_where = " WHERE " + " AND ".join(conditions) if conditions else ""
-                sql_history = sql_history_base + sql_where + " ORDER BY timestamp DESC"
+                sql_where, filter_params = history_date_filter(start_date_str, end_date_str)
+                query_params = list(filter_params)
+                sql_history = sql_history_base + sql_where + " ORDER BY timestamp DESC, id DESC"
                 if not for_export:
                     sql_history += " LIMIT %s"
                     query_params.append(limit_chart)
@@ -190,31 +418,75 @@ def get_sentiment_data_from_db(limit_display=MAX_HISTORY_RECORDS_DISPLAY, limit_
                         history_vix_values.append(float(vx) if vx is not None else None)
                     except (ValueError, TypeError):
                         history_vix_values.append(None)
+
+                # Long ranges: replace the capped raw series with per-bucket
+                # aggregates covering the whole range.
+                if sql_where and not for_export:
+                    cur.execute(f"SELECT min(timestamp) AS first, max(timestamp) AS last FROM sentiment_history{sql_where}", tuple(filter_params))
+                    span = cur.fetchone() or {}
+                    bucket = choose_history_bucket(span.get("first"), span.get("last"))
+                    if bucket:
+                        chart_data_extra = get_bucketed_history(cur, bucket, start_date_str, end_date_str)
+                        history_timestamps, history_fg_values, history_vix_values = (
+                            chart_data_extra.pop("timestamps"), chart_data_extra.pop("fg_values"), chart_data_extra.pop("vix_values"))
+
                 for i, r_raw in enumerate(historical_data_raw):
                     if i >= limit_display and not for_export:
                         break
-                    r_tbl = r_raw.copy()
-                    ts_tbl = r_tbl.get("timestamp")
-                    r_tbl["timestamp_display"] = ts_tbl.strftime('%Y-%m-%d %H:%M') if isinstance(ts_tbl, datetime.datetime) else "N/A"
-                    r_tbl["fear_greed_display"] = r_tbl.get("fear_greed", "N/A")
-                    try:
-                        r_tbl["vix_display"] = f"{float(r_tbl.get('vix', 0.0)):.2f}" if r_tbl.get("vix") is not None else "N/A"
-                    except (ValueError, TypeError):
-                        r_tbl["vix_display"] = "N/A"
-                    history_for_table.append(r_tbl)
+                    history_for_table.append(_history_table_row(r_raw))
+            from_db = True
         except psycopg2.Error as error:
             logger.error("Failed to read sentiment history: %s", error)
         finally:
-            conn.close()
+            release_db_connection(conn)
 
     return {
         "latest": latest_data,
         "history_table": history_for_table,
-        "chart_data": {"timestamps": history_timestamps, "fg_values": history_fg_values, "vix_values": history_vix_values},
-        "history_table_raw_for_export": historical_data_raw
+        # Keyset cursor for the page after the table, when more rows exist.
+        "history_next_cursor": (encode_history_cursor(history_for_table[-1])
+                                if len(historical_data_raw) > len(history_for_table) else None),
+        "chart_data": {"timestamps": history_timestamps, "fg_values": history_fg_values, "vix_values": history_vix_values, **chart_data_extra},
+        "history_table_raw_for_export": historical_data_raw,
+        "from_db": from_db,
     }
 
 
+def _latest_json_mtime():
+    try:
+        return os.stat(LATEST_JSON_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_dashboard_data(start_date_str=None, end_date_str=None):
+    """Dashboard payload for a date filter, served from the per-worker cache
+    while latest_indices.json is unchanged (analyze_news rewrites it after
+    every database save) and the entry is younger than
+    DASHBOARD_CACHE_TTL_SECONDS. Payloads built without the database (JSON
+    fallback) are never cached."""
+    if DASHBOARD_CACHE_TTL_SECONDS <= 0:
+        return get_sentiment_data_from_db(start_date_str=start_date_str, end_date_str=end_date_str)
+
+    key = (start_date_str or None, end_date_str or None)
+    version = _latest_json_mtime()
+    now = time.monotonic()
+    with _dashboard_cache_lock:
+        entry = _dashboard_cache.get(key)
+        if entry and entry[0] == version and now - entry[1] < DASHBOARD_CACHE_TTL_SECONDS:
+            _dashboard_cache.move_to_end(key)
+            return entry[2]
+
+    data = get_sentiment_data_from_db(start_date_str=start_date_str, end_date_str=end_date_str)
+    if data["from_db"]:
+        with _dashboard_cache_lock:
+            _dashboard_cache[key] = (version, now, data)
+            _dashboard_cache.move_to_end(key)
+            while len(_dashboard_cache) > DASHBOARD_CACHE_MAX_ENTRIES:
+                _dashboard_cache.popitem(last=False)
+    return data
+
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     vix_alert_form = VixAlertSubscriptionForm()
@@ -253,19 +525,31 @@ def index():
             flash("An error occurred while subscribing. Please try again later.", 'danger')
         finally:
             if conn:
-                conn.close()
+                release_db_connection(conn)
         return redirect(url_for('index', _anchor='vix-alert-subscription-card'))
 
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
-    processed_data = get_sentiment_data_from_db(start_date_str=start_date, end_date_str=end_date)
+    processed_data = get_dashboard_data(start_date, end_date)
+    history = processed_data.get("history_table", [])
+    history_cursor = request.args.get('cursor')
+    next_cursor = processed_data.get("history_next_cursor")
+    if history_cursor:
+        try:
+            page = get_history_page(history_cursor, MAX_HISTORY_RECORDS_DISPLAY, start_date, end_date)
+        except ValueError:
+            page, history_cursor = None, None
+        if page is not None:
+            history, next_cursor = page["rows"], page["next_cursor"]
 
     return render_template('index.html',
                            fear_greed_value=processed_data["latest"]["fear_greed_display"],
                            vix_value=processed_data["latest"]["vix_display"],
                            last_updated=processed_data["latest"]["last_updated"],
                            latest_summary=processed_data["latest"]["summary_text_display"],
-                           history=processed_data.get("history_table", []),
+                           history=history,
+                           history_cursor=history_cursor,
+                           history_next_cursor=next_cursor,
                            chart_timestamps=json.dumps(processed_data.get("chart_data", {}).get("timestamps", [])),
                            chart_fg_values=json.dumps(processed_data.get("chart_data", {}).get("fg_values", [])),
                            chart_vix_values=json.dumps(processed_data.get("chart_data", {}).get("vix_values", [])),
@@ -280,36 +564,347 @@ def healthz():
     conn = get_db_connection()
     db_status = "up" if conn else "down"
     if conn:
-        conn.close()
-    return jsonify({"status": "ok", "database": db_status}), 200
+        release_db_connection(conn)
+    pool = _pool if _pool_pid == os.getpid() else None
+    return jsonify({"status": "ok", "database": db_status, "pool": pool.stats() if pool else None}), 200
 
 
-@app.route('/export/csv')
-def export_csv():
+def _api_number(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _api_timestamp(value):
+    return value.isoformat() if isinstance(value, datetime.datetime) else None
+
+
+def _api_response(payload, etag):
+    """JSON response with caching headers. With an ETag (derived from the
+    latest sentiment_history id) a matching If-None-Match gets a 304."""
+    response = jsonify(payload)
+    if etag is None:
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={API_MAX_AGE_SECONDS}"
+    return response.make_conditional(request)
+
+
+@app.route('/api/latest')
+def api_latest():
+    data = get_dashboard_data()
+    latest = data["latest"]
+    latest_id = latest.get("id") if data["from_db"] else None
+    # Without the database only the display values from the JSON cache exist.
+    vix = latest.get("vix") if data["from_db"] else latest["vix_display"]
+    payload = {
+        "id": latest_id,
+        "fear_greed": latest["fear_greed_display"],
+        "vix": _api_number(vix),
+        "summary_text": latest["summary_text_display"],
+        "timestamp": _api_timestamp(latest.get("timestamp")) or latest["last_updated"],
+    }
+    return _api_response(payload, f"latest-{latest_id}" if latest_id is not None else None)
+
+
+@app.route('/api/history')
+def api_history():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
-    data_dict = get_sentiment_data_from_db(for_export=True, start_date_str=start_date, end_date_str=end_date)
-    history_list_raw = data_dict.get("history_table_raw_for_export", [])
+    data = get_dashboard_data(start_date, end_date)
+    latest_id = data["latest"].get("id") if data["from_db"] else None
+    payload = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "chart": data["chart_data"],
+        "history": [
+            {
+                "id": row.get("id"),
+                "timestamp": _api_timestamp(row.get("timestamp")),
+                "fear_greed": row.get("fear_greed"),
+                "vix": _api_number(row.get("vix")),
+                "summary_text": row.get("summary_text"),
+            }
+            for row in data["history_table_raw_for_export"]
+        ],
+    }
+    etag = None
+    if latest_id is not None:
+        date_filter = hashlib.sha1(f"{start_date or ''}|{end_date or ''}".encode()).hexdigest()[:12]
+        etag = f"history-{latest_id}-{date_filter}"
+    return _api_response(payload, etag)
 
-    if not history_list_raw:
-        return "No data to export for the selected criteria.", 404
 
+@app.route('/api/history/page')
+def api_history_page():
+    """Keyset-paginated history: pass the returned next_cursor as ?cursor=
+    to get the following (older) page."""
+    try:
+        limit = min(max(int(request.args.get('limit', MAX_HISTORY_RECORDS_DISPLAY)), 1), HISTORY_PAGE_MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    try:
+        page = get_history_page(request.args.get('cursor'), limit, request.args.get('start_date'), request.args.get('end_date'))
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    if page is None:
+        return jsonify({"error": "database unavailable"}), 503
+    return jsonify({
+        "items": [
+            {
+                "id": row.get("id"),
+                "timestamp": _api_timestamp(row.get("timestamp")),
+                "fear_greed": row.get("fear_greed"),
+                "vix": _api_number(row.get("vix")),
+                "summary_text": row.get("summary_text"),
+            }
+            for row in page["rows"]
+        ],
+        "next_cursor": page["next_cursor"],
+    })
+
+
+def open_history_cursor(columns, start_date_str=None, end_date_str=None):
+    """Run a filtered, time-ordered sentiment_history query on a named
+    (server-side) cursor, so rows arrive in EXPORT_ITERSIZE batches instead
+    of being loaded at once. Returns (conn, cursor, row iterator), or None
+    when the database is unavailable or nothing matches; otherwise the
+    caller must call close_history_cursor (_stream_history does)."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    sql_where, query_params = history_date_filter(start_date_str, end_date_str)
+    try:
+        cur = conn.cursor(name="history_export", cursor_factory=RealDictCursor)
+        cur.itersize = EXPORT_ITERSIZE
+        cur.execute(f"SELECT {', '.join(columns)} FROM sentiment_history{sql_where} ORDER BY timestamp DESC", tuple(query_params))
+        rows = iter(cur)
+        first = next(rows, None)
+    except psycopg2.Error as error:
+        logger.error("Failed to export sentiment history: %s", error)
+        release_db_connection(conn)
+        return None
+    if first is None:
+        close_history_cursor(conn, cur)
+        return None
+    return conn, cur, itertools.chain((first,), rows)
+
+
+def close_history_cursor(conn, cur):
+    try:
+        cur.close()
+    except psycopg2.Error:
+        pass
+    release_db_connection(conn)
+
+
+def _iter_history(rows, release):
+    """Yield the rows of an open history cursor, releasing the connection
+    as soon as they are exhausted."""
+    try:
+        yield from rows
+    except psycopg2.Error as error:
+        logger.error("Sentiment history export aborted: %s", error)
+    finally:
+        release()
+
+
+def _stream_history(opened, make_body, mimetype, headers):
+    """Response streaming make_body(rows) from an open history cursor. The
+    connection is also released when the response is closed, which the WSGI
+    server does even when the body is never iterated (HEAD requests, or a
+    client disconnecting before the first chunk)."""
+    conn, cur, rows = opened
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            close_history_cursor(conn, cur)
+
+    response = Response(make_body(_iter_history(rows, release)), mimetype=mimetype, headers=headers)
+    response.call_on_close(release)
+    return response
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _csv_chunks(rows):
+    """CSV text for the export, one chunk per EXPORT_ITERSIZE records."""
     output_stream = io.StringIO()
     csv_writer = csv.writer(output_stream)
-    headers = ["timestamp", "fear_greed", "vix", "summary_text"]
-    csv_writer.writerow(headers)
-
-    for record in history_list_raw:
+    csv_writer.writerow(["timestamp", "fear_greed", "vix", "summary_text"])
+    for i, record in enumerate(rows, 1):
         ts_obj = record.get("timestamp")
         ts_str = (ts_obj.strftime('%Y-%m-%d %H:%M:%S %Z') if ts_obj.tzinfo else ts_obj.strftime('%Y-%m-%d %H:%M:%S UTC')) if isinstance(ts_obj, datetime.datetime) else ""
         summary = record.get("summary_text", "")
         summary_cleaned = summary.replace('\r\n', ' ').replace('\n', ' ') if summary else ""
         csv_writer.writerow([ts_str, record.get("fear_greed", ""), record.get("vix", ""), summary_cleaned])
+        if i % EXPORT_ITERSIZE == 0:
+            yield output_stream.getvalue()
+            output_stream.seek(0)
+            output_stream.truncate()
+    yield output_stream.getvalue()
+
+
+@app.route('/export/csv')
+def export_csv():
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    opened = open_history_cursor(("fear_greed", "vix", "summary_text", "timestamp"), start_date, end_date)
+    if opened is None:
+        return "No data to export for the selected criteria.", 404
 
-    csv_output = output_stream.getvalue()
-    output_stream.close()
+    headers = {"Content-Disposition": "attachment;filename=sentiment_history.csv", "Vary": "Accept-Encoding"}
+    make_body = _csv_chunks
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        make_body = lambda rows: _gzip_stream(_csv_chunks(rows))  # noqa: E731
+    return _stream_history(opened, make_body, "text/csv", headers)
 
-    return Response(csv_output, mimetype="text/csv", headers={"Content-Disposition": "attachment;filename=sentiment_history.csv"})
+
+EXPORT_COLUMNS = ("id", "timestamp", "fear_greed", "vix", "summary_text")
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _ndjson_chunks(rows):
+    lines = []
+    for record in rows:
+        ts_obj = record.get("timestamp")
+        lines.append(json.dumps({
+            "id": record.get("id"),
+            "timestamp": ts_obj.isoformat() if isinstance(ts_obj, datetime.datetime) else None,
+            "fear_greed": record.get("fear_greed"),
+            "vix": float(record["vix"]) if record.get("vix") is not None else None,
+            "summary_text": record.get("summary_text"),
+        }) + "\n")
+        if len(lines) >= EXPORT_ITERSIZE:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines)
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("id", pa.int64()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("fear_greed", pa.int32()),
+        ("vix", pa.float64()),
+        ("summary_text", pa.string()),
+    ])
+
+
+def _record_batches(pa, schema, rows):
+    """Group cursor rows into typed Arrow record batches of EXPORT_ITERSIZE."""
+    def to_batch(batch):
+        return pa.record_batch([
+            pa.array([r.get("id") for r in batch], type=pa.int64()),
+            pa.array([r.get("timestamp") for r in batch], type=pa.timestamp("us", tz="UTC")),
+            pa.array([r.get("fear_greed") for r in batch], type=pa.int32()),
+            pa.array([float(r["vix"]) if r.get("vix") is not None else None for r in batch], type=pa.float64()),
+            pa.array([r.get("summary_text") for r in batch], type=pa.string()),
+        ], schema=schema)
+
+    batch = []
+    for record in rows:
+        batch.append(record)
+        if len(batch) >= EXPORT_ITERSIZE:
+            yield to_batch(batch)
+            batch = []
+    if batch:
+        yield to_batch(batch)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that buffers what Arrow writes so each batch
+    can be yielded to the client as soon as it is encoded."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_chunks(rows, file_format):
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for batch in _record_batches(pa, schema, rows):
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+@app.route('/export')
+def export_history():
+    """Stream sentiment_history as csv, ndjson, arrow (IPC stream) or
+    parquet (?format=), with the dashboard's start_date / end_date filters.
+    Rows come from a server-side cursor in EXPORT_ITERSIZE batches."""
+    file_format = request.args.get('format', 'ndjson').lower()
+    if file_format not in EXPORT_FORMATS:
+        return f"Unsupported export format {file_format!r}; choose one of {', '.join(EXPORT_FORMATS)}.", 400
+    if file_format == "csv":
+        return export_csv()
+    if file_format in ("arrow", "parquet") and not PYARROW_AVAILABLE:
+        return f"The {file_format} export requires pyarrow, which is not installed on this server.", 501
+
+    opened = open_history_cursor(EXPORT_COLUMNS, request.args.get('start_date'), request.args.get('end_date'))
+    if opened is None:
+        return "No data to export for the selected criteria.", 404
+
+    mimetype, extension = EXPORT_FORMATS[file_format]
+    headers = {"Content-Disposition": f"attachment;filename=sentiment_history.{extension}"}
+    if file_format == "ndjson":
+        make_body = _ndjson_chunks
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            make_body = lambda rows: _gzip_stream(_ndjson_chunks(rows))  # noqa: E731
+    else:
+        def make_body(rows):
+            return _arrow_chunks(rows, file_format)
+    return _stream_history(opened, make_body, mimetype, headers)
 
 
 def execute_script_on_server(script_path):
@@ -455,6 +1050,60 @@ def settings():
     return render_template('settings.html', form=form, config=config)
 
 
+def backfill_rollups(cur, since=None):
+    """Recompute the hourly and daily rollups from sentiment_history (from
+    the UTC day of `since` onward, or entirely). Rows are overwritten, so
+    running it repeatedly is safe; inserts are blocked meanwhile so the
+    incremental updates in analyze_news cannot interleave."""
+    cur.execute("LOCK TABLE sentiment_history IN SHARE MODE")
+    counts = {}
+    for unit, table in ROLLUP_TABLES.items():
+        where, params = "", ()
+        if since is not None:
+            where, params = " WHERE timestamp >= date_trunc('day', %s::timestamptz, 'UTC')", (since,)
+        cur.execute(
+            f"""
+            INSERT INTO {table} (bucket, samples, fg_sum, fg_count, fg_min, fg_max, vix_sum, vix_count, vix_min, vix_max)
+            SELECT date_trunc(%s, timestamp, 'UTC'), count(*), sum(fear_greed), count(fear_greed), min(fear_greed),
+                   max(fear_greed), sum(vix), count(vix), min(vix), max(vix)
+            FROM sentiment_history{where}
+            GROUP BY 1
+            ON CONFLICT (bucket) DO UPDATE SET
+                samples = EXCLUDED.samples, fg_sum = EXCLUDED.fg_sum, fg_count = EXCLUDED.fg_count,
+                fg_min = EXCLUDED.fg_min, fg_max = EXCLUDED.fg_max, vix_sum = EXCLUDED.vix_sum,
+                vix_count = EXCLUDED.vix_count, vix_min = EXCLUDED.vix_min, vix_max = EXCLUDED.vix_max
+            """,
+            (unit, *params),
+        )
+        counts[table] = cur.rowcount
+    return counts
+
+
+@app.cli.command("backfill-rollups")
+@click.option("--since", default=None, help="Only rebuild buckets from this UTC date (YYYY-MM-DD) onward.")
+def backfill_rollups_command(since):
+    """Rebuild the sentiment_history rollup tables."""
+    if since:
+        try:
+            since = datetime.datetime.strptime(since, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise click.BadParameter("expected YYYY-MM-DD", param_hint="--since")
+    conn = get_db_connection()
+    if not conn:
+        raise click.ClickException("Could not connect to the database.")
+    try:
+        with conn.cursor() as cur:
+            counts = backfill_rollups(cur, since)
+        conn.commit()
+    except psycopg2.Error as error:
+        conn.rollback()
+        raise click.ClickException(f"Backfill failed: {error}")
+    finally:
+        release_db_connection(conn)
+    for table, rows in counts.items():
+        click.echo(f"{table}: {rows} buckets written")
+
+
 def init_db():
     logger.info("Initializing database schema...")
     conn = get_db_connection()
@@ -469,6 +1118,7 @@ def init_db():
                     fear_greed INTEGER,
                     vix NUMERIC,
                     summary_text TEXT,
+                    model_scores JSONB,
                     timestamp TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
                 );
             """)
@@ -482,9 +1132,44 @@ def init_db():
                     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
                 );
             """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS news_articles (
+                    id BIGSERIAL PRIMARY KEY,
+                    url TEXT UNIQUE NOT NULL,
+                    source_name TEXT,
+                    ticker VARCHAR(16),
+                    title TEXT,
+                    published_at TIMESTAMPTZ,
+                    sentiment NUMERIC,
+                    first_seen_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                    last_seen_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            for table in ROLLUP_TABLES.values():
+                cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    bucket TIMESTAMPTZ PRIMARY KEY,
+                    samples INTEGER NOT NULL,
+                    fg_sum BIGINT,
+                    fg_count INTEGER NOT NULL DEFAULT 0,
+                    fg_min INTEGER,
+                    fg_max INTEGER,
+                    vix_sum NUMERIC,
+                    vix_count INTEGER NOT NULL DEFAULT 0,
+                    vix_min NUMERIC,
+                    vix_max NUMERIC
+                );
+                """)
             # Upgrade path for databases created before the alert cooldown column existed.
             cur.execute("ALTER TABLE vix_alerts_subscriptions ADD COLUMN IF NOT EXISTS last_alert_sent_at TIMESTAMPTZ;")
+            # Per-model ensemble scores, added after the initial schema.
+            cur.execute("ALTER TABLE sentiment_history ADD COLUMN IF NOT EXISTS model_scores JSONB;")
             cur.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_history_timestamp ON sentiment_history (timestamp DESC);")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_source_published ON news_articles (source_name, published_at DESC);")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_ticker_published ON news_articles (ticker, published_at DESC);")
+            # Databases that predate the rollup tables are filled with the
+            # backfill-rollups command, not here: the backfill locks
+            # sentiment_history and every worker runs this at import.
             conn.commit()
         logger.info("Database schema initialized successfully.")
         return True
@@ -492,7 +1177,7 @@ def init_db():
         logger.error("Error initializing database: %s", error)
         return False
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 # Gunicorn imports this module directly (it never runs the __main__ block),
@@ -29,20 +29,23 @@ PROJECT_ROOT = os.path.dirname(WEBSITE_DIR)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-try:
-    from website.crucialPys.webScrape import get_vix_value as get_vix_value_yfinance
-except ImportError:
-    logger.error("Could not import VIX helper from webScrape; alerts disabled.")
-
-    def get_vix_value_yfinance():
-        return None
-
 MIN_ALERT_INTERVAL = timedelta(hours=int(os.environ.get("ALERT_COOLDOWN_HOURS", "6")))
 DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
 IMAGE_FOOTER_PATH = os.path.join(PROJECT_ROOT, "website", "static", "images", "mail-footer-logo-removed.png")
 IMAGE_FOOTER_CID = 'mailfooterlogo'
 
 
+def get_vix_value_yfinance():
+    """Current VIX via webScrape's resolver, imported on first use so the
+    alert check only loads the scraper (and its dependencies) when it runs."""
+    try:
+        from website.crucialPys.webScrape import get_vix_value
+    except ImportError:
+        logger.error("Could not import VIX helper from webScrape; alerts disabled.")
+        return None
+    return get_vix_value()
+
+
 def get_db_conn_for_alerts():
     db_name = os.environ.get("DB_NAME")
     db_user = os.environ.get("DB_USER")
@@ -2,50 +2,148 @@
 parses the resulting market-sentiment summary and Fear & Greed index, and
 persists the results to PostgreSQL plus a JSON cache for the dashboard."""
 
+import hashlib
 import json
 import logging
 import os
 import re
-from datetime import datetime, timezone
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 
 import psycopg2
+import psycopg2.errors
 import requests
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
+from psycopg2.extras import Json, execute_values
 from dotenv import load_dotenv
 
 load_dotenv()
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WEBSITE_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(WEBSITE_DIR)
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from website.crucialPys import http_client  # noqa: E402
+
 logging.basicConfig(
     level=os.environ.get("LOG_LEVEL", "INFO"),
     format="%(asctime)s %(levelname)s %(name)s: %(message)s",
 )
 logger = logging.getLogger("analyze_news")
 
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-WEBSITE_DIR = os.path.dirname(SCRIPT_DIR)
 JSON_FILENAME = "financial_news_agg.json"
 JSON_NEWS_FILE_PATH = os.path.join(WEBSITE_DIR, "data_files", JSON_FILENAME)
 INDEX_JSON_OUTPUT_DIR = os.path.join(WEBSITE_DIR, "data_files")
 INDEX_JSON_FILENAME = "latest_indices.json"
 INDEX_JSON_OUTPUT_PATH = os.path.join(INDEX_JSON_OUTPUT_DIR, INDEX_JSON_FILENAME)
 AI_CONFIG_PATH = os.path.join(WEBSITE_DIR, "data_files", "ai_config.json")
+# Fingerprints of already-scored articles plus the rolling sentiment state
+# used by incremental analysis.
+ANALYSIS_STATE_PATH = os.path.join(WEBSITE_DIR, "data_files", "analysis_state.json")
+PROVIDER_STATS_PATH = os.path.join(WEBSITE_DIR, "data_files", "llm_provider_stats.json")
 
 DB_HOST = os.environ.get("DB_HOST", "localhost")
 DB_NAME = os.environ.get("DB_NAME")
 DB_USER = os.environ.get("DB_USER")
 DB_PASS = os.environ.get("DB_PASS")
 DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+# Scraped articles are upserted into news_articles with their lexicon score;
+# rows per INSERT statement (one round-trip each).
+PERSIST_ARTICLES = os.environ.get("PERSIST_ARTICLES", "1") == "1"
+ARTICLE_INSERT_PAGE_SIZE = int(os.environ.get("ARTICLE_INSERT_PAGE_SIZE", "500"))
 
 MAX_TOKENS = 4096  # Kept small for compatibility with local models.
 OLLAMA_TIMEOUT = int(os.environ.get("OLLAMA_TIMEOUT", "300"))
 CLOUD_TIMEOUT = int(os.environ.get("CLOUD_TIMEOUT", "60"))
 
+# Provider chain: providers are tried in order ("provider_chain" in
+# ai_config.json, else LLM_PROVIDER_CHAIN, a comma-separated list such as
+# "ollama,cloud"). With neither set only the active provider runs: falling
+# back to the paid cloud API has to be opted into explicitly. Each provider gets a wall-clock budget for a whole
+# analysis (which may span several chunked calls); a slow provider is
+# hedged by starting the next one once it has run longer than its
+# LLM_HEDGE_PERCENTILE latency (LLM_HEDGE_DEFAULT_DELAY until enough
+# samples exist). The first result with a parsed score wins.
+OLLAMA_RUN_TIMEOUT = int(os.environ.get("OLLAMA_RUN_TIMEOUT", "900"))
+CLOUD_RUN_TIMEOUT = int(os.environ.get("CLOUD_RUN_TIMEOUT", "300"))
+LLM_PROVIDER_CHAIN = [p.strip() for p in os.environ.get("LLM_PROVIDER_CHAIN", "").split(",") if p.strip()]
+LLM_HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", "90"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.environ.get("LLM_HEDGE_DEFAULT_DELAY", "180"))
+LLM_HEDGE_MIN_SAMPLES = 5
+
+# Ensemble mode: when ai_config.json has an "ensemble" list of members
+# (each {"provider": "ollama"|"cloud", ...overrides such as "model" or
+# "temperature"}), every member analyzes the same articles concurrently and
+# the scores are combined with ENSEMBLE_AGGREGATE ("median" or
+# "trimmed_mean", dropping ENSEMBLE_TRIM_FRACTION of scores from each end).
+# Members still running after ENSEMBLE_TIMEOUT seconds are left out.
+ENSEMBLE_AGGREGATE = os.environ.get("ENSEMBLE_AGGREGATE", "median").lower()
+ENSEMBLE_TRIM_FRACTION = float(os.environ.get("ENSEMBLE_TRIM_FRACTION", "0.2"))
+ENSEMBLE_TIMEOUT = int(os.environ.get("ENSEMBLE_TIMEOUT", "600"))
+# Members within this many points of the aggregate count as agreeing.
+ENSEMBLE_AGREEMENT_BAND = float(os.environ.get("ENSEMBLE_AGREEMENT_BAND", "10"))
+
+# Offline lexicon scorer (lexicon_sentiment.py): ranks articles by
+# sentiment strength before prompt packing, so the token budget drops the
+# most neutral ones first (LEXICON_PREFILTER_TOP_N > 0 also caps the count);
+# the survivors are sent in their original newest-first order. It also
+# supplies the score when no LLM produces one.
+LEXICON_PREFILTER = os.environ.get("LEXICON_PREFILTER", "1") == "1"
+LEXICON_PREFILTER_TOP_N = int(os.environ.get("LEXICON_PREFILTER_TOP_N", "0"))
+LEXICON_FALLBACK = os.environ.get("LEXICON_FALLBACK", "1") == "1"
+LATENCY_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600)
+MAX_LATENCY_SAMPLES = 200
+
+# Opt-in: article sets whose estimated prompt size exceeds this many tokens
+# are analyzed map-reduce style: token-budgeted batches are analyzed in
+# parallel, then their summaries and scores are merged. Every batch is an
+# extra model call, so this only pays off for models whose context window
+# is smaller than PROMPT_TOKEN_BUDGET. 0 (the default) disables it.
+LLM_CHUNK_TOKEN_BUDGET = int(os.environ.get("LLM_CHUNK_TOKEN_BUDGET", "0"))
+OLLAMA_MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "2"))
+CLOUD_MAX_CONCURRENCY = int(os.environ.get("CLOUD_MAX_CONCURRENCY", "4"))
+CHARS_PER_TOKEN = 4  # Rough average for English text; good enough for budgeting.
+
+# Content-addressed cache of raw model responses, keyed by provider, model
+# and the full prompt (template plus packed article payload), so identical
+# inputs skip inference. Only answers carrying an explicit Fear & Greed
+# marker are cached, so a malformed answer is retried rather than replayed. Entries expire after LLM_CACHE_TTL_HOURS (0
+# disables the cache); least recently used entries are evicted once the
+# directory exceeds LLM_CACHE_MAX_BYTES.
+LLM_CACHE_DIR = os.path.join(WEBSITE_DIR, "data_files", "llm_cache")
+LLM_CACHE_TTL_HOURS = float(os.environ.get("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# "incremental" sends only articles not scored before and blends the result
+# into the rolling state; the summary is the last full-window summary plus
+# the newest articles' summary. A full re-analysis still runs every
+# FULL_REANALYSIS_INTERVAL_HOURS. "full" analyzes the whole window each run.
+ANALYSIS_MODE = os.environ.get("ANALYSIS_MODE", "incremental").lower()
+FULL_REANALYSIS_INTERVAL_HOURS = float(os.environ.get("FULL_REANALYSIS_INTERVAL_HOURS", "6"))
+
+# Prompt packing: articles are sent as one compact line each (no URLs,
+# boilerplate summaries dropped, summaries truncated, near-duplicate
+# headlines removed), newest first, up to PROMPT_TOKEN_BUDGET tokens.
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "8000"))
+PROMPT_SUMMARY_MAX_CHARS = int(os.environ.get("PROMPT_SUMMARY_MAX_CHARS", "200"))
+PROMPT_DEDUPE_SIMILARITY = float(os.environ.get("PROMPT_DEDUPE_SIMILARITY", "0.8"))
+
 # Matches the "FEAR AND GREED INDEX = 75" marker the prompt asks the model
 # to emit, tolerating "&"/"and", optional colon/equals and markdown bold.
 FG_MARKER = r"FEAR\s*(?:AND|&)\s*GREED\s*INDEX"
 
+# Stream model output, stripping <think> blocks as they arrive and closing
+# the connection once a complete Fear & Greed marker has been seen (the
+# lookahead requires a character after the digits so "7" of "75" does not
+# stop early). 0 falls back to single blocking responses.
+LLM_STREAMING = os.environ.get("LLM_STREAMING", "1") == "1"
+FG_COMPLETE_RE = re.compile(rf"{FG_MARKER}\s*[:=]?\s*\*{{0,2}}\d{{1,3}}(?=\D)", re.IGNORECASE)
+
 
 def load_ai_config():
     if os.path.exists(AI_CONFIG_PATH):
@@ -57,6 +155,22 @@ def load_ai_config():
     return None
 
 
+def _lexicon():
+    # NumPy is imported on first use to keep script start-up fast.
+    from website.crucialPys import lexicon_sentiment
+    return lexicon_sentiment
+
+
+def preload_dependencies():
+    """Import the lexicon scorer (and the Azure SDK when the configured
+    provider needs it) up front. Used by the in-process scheduler so forked
+    runs inherit the imports."""
+    _lexicon()
+    config = load_ai_config() or {}
+    if config.get("provider", "ollama") != "ollama" and config.get("cloud", {}).get("provider_type", "azure").lower() == "azure":
+        import azure.ai.inference  # noqa: F401
+
+
 def load_data_from_json(filename):
     try:
         with open(filename, 'r', encoding='utf-8') as f:
@@ -125,10 +239,297 @@ def parse_analysis_results(analysis_text):
     return {"fear_greed": fear_greed, "summary_text": summary}
 
 
-def analyze_with_ollama(news_articles, config):
+def has_explicit_score(analysis_text):
+    """True when the output carries a valid "FEAR AND GREED INDEX = X"
+    marker rather than a score guessed from trailing numbers or wording."""
+    match = re.search(rf"{FG_MARKER}\s*[:=]?\s*\*{{0,2}}(\d{{1,3}})\*{{0,2}}", analysis_text or "", re.IGNORECASE)
+    return bool(match) and 0 <= int(match.group(1)) <= 100
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _headline_words(title):
+    # Google News appends " - Publisher" to headlines; ignore it so the same
+    # story from two outlets is recognised as a duplicate.
+    title = re.sub(r"\s+-\s+[^-]{2,40}$", "", title or "")
+    return set(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def compact_article(article):
+    """Reduce an article to the fields that carry sentiment signal: title,
+    a truncated summary (dropped when it is boilerplate such as
+    "Publisher: X" or just repeats the title) and a short source name."""
+    title = " ".join((article.get("title") or "").split())
+    summary = " ".join((article.get("summary") or "").split())
+    if summary in ("", "N/A") or summary.startswith("Publisher:") or summary.lower().startswith(title.lower()[:60]):
+        summary = ""
+    elif len(summary) > PROMPT_SUMMARY_MAX_CHARS:
+        summary = summary[:PROMPT_SUMMARY_MAX_CHARS].rsplit(" ", 1)[0] + "..."
+    source = article.get("source_name") or article.get("source") or ""
+    source_match = re.fullmatch(r"RSS \((.+)\)", source)
+    return {"title": title, "summary": summary, "source": source_match.group(1) if source_match else source}
+
+
+def article_line(article):
+    """One prompt line for a compacted article: "- title — summary (source)"."""
+    line = f"- {article['title']}"
+    if article.get("summary"):
+        line += f" — {article['summary']}"
+    if article.get("source"):
+        line += f" ({article['source']})"
+    return line
+
+
+def article_tokens(article):
+    """Estimated prompt tokens for one article line, newline included."""
+    return estimate_tokens(article_line(compact_article(article))) + 1
+
+
+def format_articles_for_prompt(articles):
+    return "\n".join(article_line(compact_article(a)) for a in articles)
+
+
+def pack_articles(articles, token_budget=None):
+    """Dedupe near-identical headlines and keep articles, in order, until
+    the compact prompt lines reach token_budget. Returns the kept articles
+    and a report comparing estimated tokens against the old JSON dump."""
+    token_budget = PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    packed, kept_words = [], []
+    duplicates = over_budget = 0
+    packed_tokens = 0
+    for article in articles:
+        compact = compact_article(article)
+        if not compact["title"]:
+            continue
+        words = _headline_words(compact["title"])
+        if words and any(len(words & seen) / len(words | seen) >= PROMPT_DEDUPE_SIMILARITY for seen in kept_words):
+            duplicates += 1
+            continue
+        tokens = estimate_tokens(article_line(compact)) + 1
+        if token_budget > 0 and packed_tokens + tokens > token_budget:
+            over_budget += 1
+            continue
+        packed.append(article)
+        kept_words.append(words)
+        packed_tokens += tokens
+
+    original_tokens = estimate_tokens(json.dumps(articles))
+    report = {
+        "articles_in": len(articles),
+        "articles_out": len(packed),
+        "duplicates_dropped": duplicates,
+        "over_budget_dropped": over_budget,
+        "tokens_before": original_tokens,
+        "tokens_after": packed_tokens,
+        "tokens_saved": max(0, original_tokens - packed_tokens),
+    }
+    return packed, report
+
+
+_llm_cache_stats = {"hits": 0, "misses": 0}
+_llm_cache_lock = threading.Lock()
+
+
+def llm_cache_key(*parts):
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def llm_cache_get(key):
+    """Return the cached response for key, or None on a miss or when the
+    entry has expired. A hit refreshes the entry's LRU position (mtime)."""
+    if LLM_CACHE_TTL_HOURS <= 0:
+        return None
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    text = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if time.time() - entry["created"] <= LLM_CACHE_TTL_HOURS * 3600:
+            text = entry["response"]
+            os.utime(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        logger.warning("Ignoring unreadable LLM cache entry %s: %s", path, error)
+    with _llm_cache_lock:
+        _llm_cache_stats["hits" if text is not None else "misses"] += 1
+    return text
+
+
+def llm_cache_put(key, text):
+    if LLM_CACHE_TTL_HOURS <= 0 or not text:
+        return
+    path = os.path.join(LLM_CACHE_DIR, f"{key}.json")
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"created": time.time(), "response": text}, f)
+        os.replace(tmp_path, path)
+        _evict_llm_cache()
+    except OSError as error:
+        logger.warning("Could not write LLM cache entry %s: %s", path, error)
+
+
+def _evict_llm_cache():
+    """Drop least recently used entries until the cache fits in
+    LLM_CACHE_MAX_BYTES. Expired entries are removed when they are read."""
+    with _llm_cache_lock:
+        entries = []
+        for name in os.listdir(LLM_CACHE_DIR):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(LLM_CACHE_DIR, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= LLM_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def strip_think_stream(chunks):
+    """Yield the visible text of a streamed response, dropping <think>...
+    </think> blocks even when a tag is split across chunks."""
+    open_tag, close_tag = "<think>", "</think>"
+    buffer, in_think = "", False
+    for chunk in chunks:
+        buffer += chunk
+        while buffer:
+            if in_think:
+                end = buffer.find(close_tag)
+                if end < 0:
+                    buffer = buffer[-(len(close_tag) - 1):]
+                    break
+                buffer, in_think = buffer[end + len(close_tag):], False
+            else:
+                start = buffer.find(open_tag)
+                if start >= 0:
+                    if start:
+                        yield buffer[:start]
+                    buffer, in_think = buffer[start + len(open_tag):], True
+                    continue
+                # Hold back only a trailing partial "<think" (e.g. "<th").
+                keep = next((k for k in range(min(len(open_tag) - 1, len(buffer)), 0, -1)
+                             if open_tag.startswith(buffer[-k:])), 0)
+                if len(buffer) > keep:
+                    yield buffer[:len(buffer) - keep]
+                    buffer = buffer[len(buffer) - keep:]
+                break
+    if buffer and not in_think:
+        yield buffer
+
+
+def collect_stream(chunks, label):
+    """Consume streamed text chunks, stopping at the first complete Fear &
+    Greed marker. Logs time to first token and throughput (one streamed
+    chunk is counted as one token). Returns the visible text."""
+    started = time.monotonic()
+    metrics = {"first_token_at": None, "tokens": 0}
+
+    def timed(source):
+        for chunk in source:
+            if metrics["first_token_at"] is None:
+                metrics["first_token_at"] = time.monotonic()
+            metrics["tokens"] += 1
+            yield chunk
+
+    text, stopped_early = "", False
+    visible = strip_think_stream(timed(chunks))
+    try:
+        for piece in visible:
+            text += piece
+            if FG_COMPLETE_RE.search(text):
+                stopped_early = True
+                break
+    finally:
+        visible.close()
+
+    elapsed = time.monotonic() - started
+    ttft = metrics["first_token_at"] - started if metrics["first_token_at"] is not None else None
+    logger.info(
+        "%s stream: first token after %s, %s tokens in %.2fs (%.1f tokens/s)%s",
+        label, f"{ttft:.2f}s" if ttft is not None else "n/a", metrics["tokens"], elapsed,
+        metrics["tokens"] / elapsed if elapsed > 0 else 0.0,
+        ", stopped at Fear & Greed marker" if stopped_early else "",
+    )
+    return text.strip()
+
+
+def _ollama_stream_chunks(response):
+    for line in response.iter_lines():
+        if not line:
+            continue
+        data = json.loads(line)
+        if data.get("error"):
+            raise ValueError(data["error"])
+        if data.get("response"):
+            yield data["response"]
+        if data.get("done"):
+            return
+
+
+def _openai_stream_chunks(response):
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            return
+        choices = json.loads(payload).get("choices") or []
+        content = (choices[0].get("delta") or {}).get("content") if choices else None
+        if content:
+            yield content
+
+
+def ollama_generate(prompt, config):
     endpoint = config.get("endpoint", "http://localhost:11434/api/generate")
     model = config.get("model", "deepseek-r1:1.5b")
+    temperature = config.get("temperature")
+    # Sampling settings are part of the key: ensemble members that differ
+    # only in temperature must not replay each other's answers.
+    cache_key = llm_cache_key("ollama", model, temperature, prompt)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    body = {"model": model, "prompt": prompt, "stream": LLM_STREAMING}
+    if temperature is not None:
+        body["options"] = {"temperature": float(temperature)}
+    try:
+        response = http_client.get_session().post(endpoint, json=body, timeout=OLLAMA_TIMEOUT, stream=LLM_STREAMING)
+        try:
+            response.raise_for_status()
+            if LLM_STREAMING:
+                text = collect_stream(_ollama_stream_chunks(response), f"Ollama ({model})") or None
+            else:
+                text = response.json().get("response")
+        finally:
+            # Closing mid-stream also tells Ollama to stop generating.
+            response.close()
+        if has_explicit_score(text):
+            llm_cache_put(cache_key, text)
+        return text
+    except requests.exceptions.RequestException as error:
+        logger.error("Ollama request failed: %s", error)
+        return None
+    except ValueError as error:
+        logger.error("Ollama returned invalid JSON: %s", error)
+        return None
+
 
+def analyze_with_ollama(news_articles, config):
     prompt = (
         "Instructions: Analyze the following financial news articles. "
         "Provide a concise summary of the overall market sentiment. "
@@ -136,46 +537,46 @@ def analyze_with_ollama(news_articles, config):
         "At the very end of your response, you MUST provide a numeric Fear & Greed Index score between 0 and 100 "
         "where 0 is extreme fear and 100 is extreme greed. "
         "Format the final line exactly like this: FEAR AND GREED INDEX = [value]\n\n"
-        f"Articles: {json.dumps(news_articles)}"
+        f"Articles (newest first, one per line: headline — summary (source)):\n{format_articles_for_prompt(news_articles)}"
     )
-
-    try:
-        response = requests.post(endpoint, json={
-            "model": model,
-            "prompt": prompt,
-            "stream": False
-        }, timeout=OLLAMA_TIMEOUT)
-        response.raise_for_status()
-        return response.json().get("response")
-    except requests.exceptions.RequestException as error:
-        logger.error("Ollama request failed: %s", error)
-        return None
-    except ValueError as error:
-        logger.error("Ollama returned invalid JSON: %s", error)
-        return None
+    return ollama_generate(prompt, config)
 
 
-def analyze_with_cloud(news_articles, config):
+def cloud_complete(system_msg, user_msg, config):
     p_type = config.get("provider_type", "azure").lower()
     endpoint = config.get("endpoint")
     api_key = config.get("api_key")
     model = config.get("model")
+    temperature = float(config.get("temperature", 0.5))
 
     if not endpoint or not api_key:
         logger.error("Cloud provider selected but endpoint/api_key are not configured.")
         return None
 
-    system_msg = "You are a financial analyst. Analyze news and conclude with 'FEAR AND GREED INDEX = [value]'. You may use markdown."
-    user_msg = f"Articles: {json.dumps(news_articles)}"
+    cache_key = llm_cache_key(p_type, endpoint, model, temperature, system_msg, user_msg)
+    cached = llm_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    text = _cloud_request(p_type, endpoint, api_key, model, system_msg, user_msg, temperature)
+    if has_explicit_score(text):
+        llm_cache_put(cache_key, text)
+    return text
+
 
+def _cloud_request(p_type, endpoint, api_key, model, system_msg, user_msg, temperature=0.5):
     if p_type == "azure":
         try:
+            # Imported lazily: the Azure SDK is only needed for this provider.
+            from azure.ai.inference import ChatCompletionsClient
+            from azure.ai.inference.models import SystemMessage, UserMessage
+            from azure.core.credentials import AzureKeyCredential
+
             client = ChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
             response = client.complete(
                 messages=[SystemMessage(content=system_msg), UserMessage(content=user_msg)],
                 model=model,
                 max_tokens=MAX_TOKENS,
-                temperature=0.5
+                temperature=temperature
             )
             return response.choices[0].message.content
         except Exception as error:
@@ -191,17 +592,520 @@ def analyze_with_cloud(news_articles, config):
                 {"role": "system", "content": system_msg},
                 {"role": "user", "content": user_msg}
             ],
-            "max_tokens": MAX_TOKENS
+            "max_tokens": MAX_TOKENS,
+            "temperature": temperature,
+            "stream": LLM_STREAMING
         }
-        response = requests.post(endpoint, headers=headers, json=data, timeout=CLOUD_TIMEOUT)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
+        response = http_client.get_session().post(endpoint, headers=headers, json=data, timeout=CLOUD_TIMEOUT, stream=LLM_STREAMING)
+        try:
+            response.raise_for_status()
+            if LLM_STREAMING:
+                return collect_stream(_openai_stream_chunks(response), f"Cloud ({model})") or None
+            return response.json()["choices"][0]["message"]["content"]
+        finally:
+            response.close()
     except (requests.exceptions.RequestException, KeyError, ValueError) as error:
         logger.error("Cloud API request failed: %s", error)
         return None
 
 
-def save_results_to_db(analysis_data, vix_value, timestamp):
+def analyze_with_cloud(news_articles, config):
+    system_msg = "You are a financial analyst. Analyze news and conclude with 'FEAR AND GREED INDEX = [value]'. You may use markdown."
+    user_msg = f"Articles (newest first, one per line: headline — summary (source)):\n{format_articles_for_prompt(news_articles)}"
+    return cloud_complete(system_msg, user_msg, config)
+
+
+def split_articles_into_batches(articles, token_budget):
+    """Greedily pack articles, in order, into batches whose prompt lines
+    stay within token_budget (an oversized article gets its own batch)."""
+    batches, current, current_tokens = [], [], 0
+    for article in articles:
+        tokens = article_tokens(article)
+        if current and current_tokens + tokens > token_budget:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(article)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def merge_partial_scores(partials):
+    """Article-weighted mean of the partial Fear & Greed scores of batches
+    that emitted the explicit marker; scores the parser only guessed from
+    trailing numbers or wording are left out. Returns None if no batch
+    produced an explicit score."""
+    scored = [(p["fear_greed"], p["article_count"]) for p in partials
+              if p.get("fear_greed") is not None and p.get("explicit")]
+    total = sum(count for _, count in scored)
+    if not total:
+        return None
+    return round(sum(score * count for score, count in scored) / total)
+
+
+def _reduce_summaries(partials, provider, provider_config):
+    instructions = (
+        "Instructions: The following are partial market-sentiment analyses, each covering one batch of "
+        "financial news articles. Merge them into one concise summary of the overall market sentiment. "
+        "You MAY use markdown (bolding, lists) to improve readability. Do not include a Fear & Greed score."
+    )
+    payload = "\n\n".join(
+        f"Batch {i} ({p['article_count']} articles, batch score {p['fear_greed'] if p['fear_greed'] is not None else 'unknown'}):\n{p['summary_text']}"
+        for i, p in enumerate(partials, 1)
+    )
+    if provider == "ollama":
+        return ollama_generate(f"{instructions}\n\nPartial analyses:\n{payload}", provider_config)
+    return cloud_complete(instructions, f"Partial analyses:\n{payload}", provider_config)
+
+
+def analyze_in_chunks(articles, provider, provider_config, token_budget=None):
+    """Map-reduce analysis. Map: each token-budgeted batch is analyzed with
+    the normal prompt, with at most OLLAMA_MAX_CONCURRENCY /
+    CLOUD_MAX_CONCURRENCY requests in flight. Reduce: the batch summaries
+    are merged by one more model call (or concatenated if it fails) and the
+    explicit batch scores are combined as an article-weighted mean. Returns text in
+    the usual format for parse_analysis_results, or None if every batch
+    failed."""
+    token_budget = LLM_CHUNK_TOKEN_BUDGET if token_budget is None else token_budget
+    batches = split_articles_into_batches(articles, token_budget)
+    analyze = analyze_with_ollama if provider == "ollama" else analyze_with_cloud
+    concurrency = OLLAMA_MAX_CONCURRENCY if provider == "ollama" else CLOUD_MAX_CONCURRENCY
+    concurrency = max(1, min(concurrency, len(batches)))
+    logger.info("Analyzing %s articles in %s batches (%s concurrent)", len(articles), len(batches), concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm") as executor:
+        texts = list(executor.map(lambda batch: analyze(batch, provider_config), batches))
+
+    partials = [
+        {**parse_analysis_results(text), "article_count": len(batch), "explicit": has_explicit_score(text)}
+        for batch, text in zip(batches, texts) if text
+    ]
+    if not partials:
+        return None
+    if len(partials) < len(batches):
+        logger.warning("%s of %s analysis batches failed", len(batches) - len(partials), len(batches))
+
+    fear_greed = merge_partial_scores(partials)
+    if len(partials) == 1:
+        summary = partials[0]["summary_text"]
+    else:
+        reduced = _reduce_summaries(partials, provider, provider_config)
+        summary = parse_analysis_results(reduced)["summary_text"] if reduced else ""
+        if not summary:
+            logger.warning("Summary merge step failed; concatenating batch summaries.")
+            summary = "\n\n".join(p["summary_text"] for p in partials if p["summary_text"])
+
+    if fear_greed is None:
+        return summary
+    return f"{summary}\n\nFEAR AND GREED INDEX = {fear_greed}"
+
+
+def analyze_with_provider(articles, provider, provider_config):
+    """Run one provider over already-packed articles, switching to chunked
+    map-reduce analysis when the prompt would exceed LLM_CHUNK_TOKEN_BUDGET."""
+    if LLM_CHUNK_TOKEN_BUDGET > 0 and sum(article_tokens(a) for a in articles) > LLM_CHUNK_TOKEN_BUDGET:
+        return analyze_in_chunks(articles, provider, provider_config)
+    if provider == "ollama":
+        logger.info("Running local analysis using Ollama (%s)...", provider_config.get('model'))
+        return analyze_with_ollama(articles, provider_config)
+    logger.info("Running cloud analysis...")
+    return analyze_with_cloud(articles, provider_config)
+
+
+def provider_chain(config):
+    """Ordered provider names to try for this config: its provider_chain,
+    else LLM_PROVIDER_CHAIN, else just the active provider."""
+    chain = config.get("provider_chain")
+    if not (isinstance(chain, list) and chain):
+        chain = LLM_PROVIDER_CHAIN
+    if chain:
+        return [p for p in chain if p in ("ollama", "cloud")]
+    return ["ollama" if config.get("provider", "ollama") == "ollama" else "cloud"]
+
+
+def load_provider_stats(path=None):
+    path = path or PROVIDER_STATS_PATH
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        return stats if isinstance(stats, dict) else {}
+    except (OSError, ValueError) as error:
+        logger.warning("Could not read provider stats %s: %s", path, error)
+        return {}
+
+
+def save_provider_stats(stats, path=None):
+    path = path or PROVIDER_STATS_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as error:
+        logger.warning("Could not write provider stats %s: %s", path, error)
+        return False
+
+
+def record_provider_result(stats, name, outcome, latency):
+    """Add one run to a provider's stats: outcome counts ("success",
+    "invalid", "error", "timeout"), a cumulative latency histogram over
+    LATENCY_BUCKETS and the most recent successful latencies."""
+    entry = stats.setdefault(name, {"outcomes": {}, "latency_histogram": {}, "recent_latencies": []})
+    entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+    bucket = next((f"<={b}s" for b in LATENCY_BUCKETS if latency <= b), f">{LATENCY_BUCKETS[-1]}s")
+    entry["latency_histogram"][bucket] = entry["latency_histogram"].get(bucket, 0) + 1
+    if outcome == "success":
+        entry["recent_latencies"] = (entry["recent_latencies"] + [round(latency, 3)])[-MAX_LATENCY_SAMPLES:]
+    return entry
+
+
+def hedge_delay(stats, name):
+    """Seconds to wait on a provider before starting the next one."""
+    samples = sorted((stats.get(name) or {}).get("recent_latencies", []))
+    if len(samples) < LLM_HEDGE_MIN_SAMPLES:
+        return LLM_HEDGE_DEFAULT_DELAY
+    index = min(len(samples) - 1, int(round(LLM_HEDGE_PERCENTILE / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def _timed_provider_call(articles, provider, provider_config):
+    started = time.monotonic()
+    try:
+        text, error = analyze_with_provider(articles, provider, provider_config), None
+    except Exception as exc:
+        text, error = None, exc
+    return text, time.monotonic() - started, error
+
+
+def run_provider_chain(articles, config):
+    """Analyze with the provider chain, hedging slow providers and falling
+    back on failures. Returns the first output whose parse yields a Fear &
+    Greed score, else the last non-empty output (or None)."""
+    chain = provider_chain(config)
+    if not chain:
+        logger.error("No usable provider in provider_chain %s", config.get("provider_chain"))
+        return None
+    stats = load_provider_stats()
+    queue = list(chain)
+    executor = ThreadPoolExecutor(max_workers=max(1, len(chain)), thread_name_prefix="provider")
+    pending = {}  # future -> (provider, started, deadline)
+    winner = fallback_text = None
+    last_launch = 0.0
+
+    def launch_next():
+        nonlocal last_launch
+        name = queue.pop(0)
+        provider_config = config.get(name, {})
+        budget = provider_config.get("timeout") or (OLLAMA_RUN_TIMEOUT if name == "ollama" else CLOUD_RUN_TIMEOUT)
+        last_launch = time.monotonic()
+        pending[executor.submit(_timed_provider_call, articles, name, provider_config)] = (name, last_launch, last_launch + budget)
+
+    try:
+        launch_next()
+        while pending and winner is None:
+            now = time.monotonic()
+            next_deadline = min(deadline for _, _, deadline in pending.values())
+            newest = max(pending.values(), key=lambda item: item[1])[0]
+            hedge_at = last_launch + hedge_delay(stats, newest) if queue else float("inf")
+            done, _ = wait(pending, timeout=max(0.0, min(next_deadline, hedge_at) - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, _, _ = pending.pop(future)
+                text, elapsed, error = future.result()
+                if text and parse_analysis_results(text)["fear_greed"] is not None:
+                    record_provider_result(stats, name, "success", elapsed)
+                    if winner is None:
+                        winner = text
+                        logger.info("Provider %s answered in %.1fs", name, elapsed)
+                    continue
+                record_provider_result(stats, name, "invalid" if text else "error", elapsed)
+                fallback_text = fallback_text or text
+                logger.warning("Provider %s failed after %.1fs: %s", name, elapsed, error or ("no score in output" if text else "no output"))
+                if queue and winner is None:
+                    launch_next()
+            if winner is not None:
+                break
+
+            now = time.monotonic()
+            for future, (name, started, deadline) in list(pending.items()):
+                if now >= deadline:
+                    pending.pop(future)
+                    record_provider_result(stats, name, "timeout", now - started)
+                    logger.warning("Provider %s exceeded its %.0fs budget", name, deadline - started)
+                    if queue:
+                        launch_next()
+            if queue and not done and time.monotonic() >= hedge_at:
+                logger.info("Provider %s slower than its p%.0f latency; hedging with %s", newest, LLM_HEDGE_PERCENTILE, queue[0])
+                launch_next()
+            if not pending and queue:
+                launch_next()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        save_provider_stats(stats)
+    return winner or fallback_text
+
+
+def aggregate_scores(scores, method=None):
+    """Combine member scores by median or trimmed mean and report how well
+    the members agree."""
+    method = method or ENSEMBLE_AGGREGATE
+    ordered = sorted(scores)
+    count = len(ordered)
+    if method == "trimmed_mean":
+        trim = int(count * ENSEMBLE_TRIM_FRACTION)
+        kept = ordered[trim:count - trim] or ordered
+        value = sum(kept) / len(kept)
+    else:
+        middle = count // 2
+        value = ordered[middle] if count % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    mean = sum(ordered) / count
+    return {
+        "value": round(value, 2),
+        "method": method,
+        "stdev": round((sum((s - mean) ** 2 for s in ordered) / count) ** 0.5, 2),
+        "spread": ordered[-1] - ordered[0],
+        "agreement": round(sum(1 for s in ordered if abs(s - value) <= ENSEMBLE_AGREEMENT_BAND) / count, 2),
+    }
+
+
+def _member_label(member, provider_config):
+    return member.get("name") or f"{member.get('provider', 'ollama')}:{provider_config.get('model', '')}"
+
+
+def analyze_ensemble(articles, config):
+    """Run every ensemble member concurrently over the same articles.
+    Returns (text, details): text carries the summary of the member closest
+    to the aggregate plus the aggregate score; details lists per-model
+    scores and agreement stats. Scores guessed without the explicit marker
+    only count when no member produced one."""
+    members = []
+    for member in config["ensemble"]:
+        provider = "ollama" if member.get("provider", "ollama") == "ollama" else "cloud"
+        overrides = {k: v for k, v in member.items() if k not in ("provider", "name")}
+        provider_config = {**config.get(provider, {}), **overrides}
+        members.append((_member_label(member, provider_config), provider, provider_config))
+
+    # Keyed by member index: two members may share a label (the same model
+    # listed twice to average out sampling noise).
+    results = {}
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(members), thread_name_prefix="ensemble")
+    futures = {executor.submit(_timed_provider_call, articles, provider, provider_config): i
+               for i, (_, provider, provider_config) in enumerate(members)}
+    try:
+        done, not_done = wait(futures, timeout=ENSEMBLE_TIMEOUT)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    for future in done:
+        text, elapsed, error = future.result()
+        if error:
+            logger.warning("Ensemble member %s failed: %s", members[futures[future]][0], error)
+        results[futures[future]] = (text, elapsed)
+    for future in not_done:
+        logger.warning("Ensemble member %s did not finish within %ss", members[futures[future]][0], ENSEMBLE_TIMEOUT)
+
+    model_scores = []
+    summaries = []
+    for i, (label, _, _) in enumerate(members):
+        text, elapsed = results.get(i, (None, None))
+        parsed = parse_analysis_results(text)
+        summaries.append(parsed["summary_text"])
+        model_scores.append({
+            "model": label,
+            "fear_greed": parsed["fear_greed"],
+            "explicit": has_explicit_score(text),
+            "seconds": round(elapsed, 2) if elapsed is not None else None,
+        })
+
+    explicit = [i for i, m in enumerate(model_scores) if m["fear_greed"] is not None and m["explicit"]]
+    counted = explicit or [i for i, m in enumerate(model_scores) if m["fear_greed"] is not None]
+    if not counted:
+        return None, {"models": model_scores}
+    stats = aggregate_scores([model_scores[i]["fear_greed"] for i in counted])
+    closest = min(counted, key=lambda i: abs(model_scores[i]["fear_greed"] - stats["value"]))
+    logger.info(
+        "Ensemble of %s/%s models in %.1fs: %s %.1f (stdev %.1f, spread %s, agreement %.0f%%)",
+        len(counted), len(members), time.monotonic() - started, stats["method"], stats["value"],
+        stats["stdev"], stats["spread"], 100 * stats["agreement"],
+    )
+    details = {"models": model_scores, **stats}
+    return f"{summaries[closest]}\n\nFEAR AND GREED INDEX = {round(stats['value'])}", details
+
+
+def analyze_articles(articles, config, details=None):
+    """Pack the articles into compact prompt lines, then analyze them with
+    the ensemble when one is configured, else the provider chain. Ensemble
+    stats are written into `details` when a dict is passed."""
+    if LEXICON_PREFILTER:
+        position = {id(article): i for i, article in enumerate(articles)}
+        articles = _lexicon().rank_articles(articles, LEXICON_PREFILTER_TOP_N)
+    articles, report = pack_articles(articles)
+    if LEXICON_PREFILTER:
+        # The ranking only decides which articles survive; the prompt
+        # promises them newest first.
+        articles.sort(key=lambda article: position[id(article)])
+    logger.info(
+        "Prompt packing: %s -> %s articles (%s near-duplicates, %s over budget), ~%s -> ~%s tokens (%s saved)",
+        report["articles_in"], report["articles_out"], report["duplicates_dropped"], report["over_budget_dropped"],
+        report["tokens_before"], report["tokens_after"], report["tokens_saved"],
+    )
+    if not articles:
+        return None
+    if config.get("ensemble"):
+        text, ensemble = analyze_ensemble(articles, config)
+        if details is not None:
+            details["ensemble"] = ensemble
+        return text
+    return run_provider_chain(articles, config)
+
+
+def article_fingerprint(article):
+    """Stable id for an article: hash of its URL and title, so a story that
+    is re-published under a new headline is scored again."""
+    key = f"{article.get('url') or ''}\n{article.get('title') or ''}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def load_analysis_state(path=None):
+    path = path or ANALYSIS_STATE_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else None
+    except (OSError, ValueError) as error:
+        logger.warning("Could not read analysis state %s: %s", path, error)
+        return None
+
+
+def save_analysis_state(state, path=None):
+    path = path or ANALYSIS_STATE_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as error:
+        logger.error("Failed to write analysis state %s: %s", path, error)
+        return False
+
+
+def _full_reanalysis_due(state, now):
+    if ANALYSIS_MODE != "incremental" or not state or state.get("fear_greed") is None:
+        return True
+    try:
+        last_full = datetime.fromisoformat(state["last_full_run_utc"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return now - last_full >= timedelta(hours=FULL_REANALYSIS_INTERVAL_HOURS)
+
+
+def merge_incremental_summary(window_summary, update_summary, new_count):
+    """The full-window summary followed by the summary of the articles that
+    arrived since. Only the latest update is kept; earlier ones are already
+    folded into the rolling score and are replaced at the next full run."""
+    if not update_summary:
+        return window_summary or ""
+    if not window_summary:
+        return update_summary
+    noun = "article" if new_count == 1 else "articles"
+    return f"{window_summary}\n\nLatest update ({new_count} new {noun}): {update_summary}"
+
+
+def run_analysis(articles, config, now=None):
+    """Analyze the current article window and return parsed results
+    ({"fear_greed", "summary_text"}), or None when the model produced no
+    output. In incremental mode only articles whose fingerprint is not in
+    the state file are sent; their score is blended into the rolling score
+    weighted by their share of the window. With an ensemble configured the
+    result also carries "ensemble" (per-model scores and agreement stats for
+    the articles analyzed in this run)."""
+    now = now or datetime.now(timezone.utc)
+    state = load_analysis_state()
+    fingerprints = [article_fingerprint(a) for a in articles]
+
+    details = {}
+    if _full_reanalysis_due(state, now):
+        analysis_text = analyze_articles(articles, config, details)
+        if not analysis_text:
+            return None
+        parsed = {**parse_analysis_results(analysis_text), **details}
+        if parsed["fear_greed"] is not None:
+            save_analysis_state({
+                "fingerprints": fingerprints,
+                "fear_greed": parsed["fear_greed"],
+                "summary_text": parsed["summary_text"],
+                "window_summary_text": parsed["summary_text"],
+                "last_full_run_utc": now.isoformat(),
+                "last_run_utc": now.isoformat(),
+            })
+        return parsed
+
+    scored = set(state.get("fingerprints", []))
+    new_articles = [a for a, fp in zip(articles, fingerprints) if fp not in scored]
+    if not new_articles:
+        logger.info("No new articles since the last analysis; reusing the rolling sentiment state.")
+        return {"fear_greed": round(state["fear_greed"]), "summary_text": state.get("summary_text", "")}
+
+    logger.info("Incremental analysis of %s new of %s articles", len(new_articles), len(articles))
+    analysis_text = analyze_articles(new_articles, config, details)
+    if not analysis_text:
+        return None
+    delta = parse_analysis_results(analysis_text)
+    if delta["fear_greed"] is None:
+        return {**delta, **details}
+
+    # States written before window_summary_text existed only have the
+    # combined summary.
+    window_summary = state.get("window_summary_text", state.get("summary_text", ""))
+    summary = merge_incremental_summary(window_summary, delta["summary_text"], len(new_articles))
+    weight = len(new_articles) / len(articles)
+    blended = (1 - weight) * state["fear_greed"] + weight * delta["fear_greed"]
+    logger.info("Blended rolling score %.1f with new-article score %s (weight %.2f) -> %.1f",
+                state["fear_greed"], delta["fear_greed"], weight, blended)
+    # Only fingerprints still in the window are kept, so the store stays
+    # bounded by the scraper's article cap.
+    save_analysis_state({
+        **state,
+        "fingerprints": fingerprints,
+        "fear_greed": round(blended, 2),
+        "summary_text": summary,
+        "window_summary_text": window_summary,
+        "last_run_utc": now.isoformat(),
+    })
+    return {"fear_greed": round(blended), "summary_text": summary, **details}
+
+
+def lexicon_fallback(articles):
+    """Score the articles with the offline lexicon when no LLM result is
+    available. Returns parsed results like run_analysis, or None."""
+    if not LEXICON_FALLBACK or not articles:
+        return None
+    started = time.monotonic()
+    result = _lexicon().analyze(articles)
+    logger.info("Lexicon fallback scored %s articles in %.1f ms: %s",
+                result["articles"], 1000 * (time.monotonic() - started), result["fear_greed"])
+    return {
+        "fear_greed": result["fear_greed"],
+        "summary_text": (
+            f"LLM analysis unavailable; lexicon-based estimate from {result['scored']} of {result['articles']} "
+            f"headlines ({result['positive']} positive, {result['negative']} negative)."
+        ),
+        "scorer": "lexicon",
+    }
+
+
+def connect_db():
+    """Open a database connection, or return None when credentials are not
+    configured."""
     # Re-read credentials at call time so values loaded after import
     # (e.g. dotenv in a parent process or test fixtures) are picked up.
     db_host = os.environ.get("DB_HOST", DB_HOST or "localhost")
@@ -211,19 +1115,85 @@ def save_results_to_db(analysis_data, vix_value, timestamp):
 
     if not all([db_name, db_user, db_pass]):
         logger.warning("Database credentials not configured; skipping DB save.")
-        return False
+        return None
+    return psycopg2.connect(
+        host=db_host, database=db_name, user=db_user, password=db_pass,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+    )
+
+
+def _rollup_upsert_sql(table, unit):
+    return f"""
+    INSERT INTO {table} AS r (bucket, samples, fg_sum, fg_count, fg_min, fg_max, vix_sum, vix_count, vix_min, vix_max)
+    SELECT date_trunc('{unit}', timestamp, 'UTC'), 1, fear_greed, (fear_greed IS NOT NULL)::int, fear_greed, fear_greed,
+           vix, (vix IS NOT NULL)::int, vix, vix
+    FROM new_row
+    ON CONFLICT (bucket) DO UPDATE SET
+        samples = r.samples + 1,
+        fg_sum = COALESCE(r.fg_sum, 0) + COALESCE(EXCLUDED.fg_sum, 0),
+        fg_count = r.fg_count + EXCLUDED.fg_count,
+        fg_min = LEAST(r.fg_min, EXCLUDED.fg_min),
+        fg_max = GREATEST(r.fg_max, EXCLUDED.fg_max),
+        vix_sum = COALESCE(r.vix_sum, 0) + COALESCE(EXCLUDED.vix_sum, 0),
+        vix_count = r.vix_count + EXCLUDED.vix_count,
+        vix_min = LEAST(r.vix_min, EXCLUDED.vix_min),
+        vix_max = GREATEST(r.vix_max, EXCLUDED.vix_max)"""
+
+
+# The history row and its hourly/daily rollup updates go out as one
+# statement: a single round-trip, and the rollups can never drift from the
+# base table on a partial failure.
+INSERT_WITH_ROLLUPS_SQL = f"""
+WITH new_row AS (
+    INSERT INTO sentiment_history (fear_greed, vix, summary_text, model_scores, timestamp)
+    VALUES (%s, %s, %s, %s, %s)
+    RETURNING fear_greed, vix, timestamp
+), hourly AS ({_rollup_upsert_sql("sentiment_rollup_hourly", "hour")}
+)
+{_rollup_upsert_sql("sentiment_rollup_daily", "day").strip()}
+"""
+# Fallbacks, tried in order, for databases the web app's init_db has not
+# migrated yet (no rollup tables, then no model_scores column). Rollups
+# missed this way are rebuilt by the backfill-rollups command.
+HISTORY_INSERT_FALLBACKS = (
+    ("INSERT INTO sentiment_history (fear_greed, vix, summary_text, model_scores, timestamp) VALUES (%s, %s, %s, %s, %s)", True),
+    ("INSERT INTO sentiment_history (fear_greed, vix, summary_text, timestamp) VALUES (%s, %s, %s, %s)", False),
+)
+
+
+def _model_scores(analysis_data):
+    """model_scores JSONB for a history row: the ensemble breakdown, plus
+    the scorer when the score did not come from the LLM (e.g. the lexicon
+    fallback), so stored rows stay distinguishable."""
+    scores = dict(analysis_data.get("ensemble") or {})
+    if analysis_data.get("scorer"):
+        scores["scorer"] = analysis_data["scorer"]
+    return Json(scores) if scores else None
+
+
+def save_results_to_db(analysis_data, vix_value, timestamp):
     try:
-        conn = psycopg2.connect(
-            host=db_host, database=db_name, user=db_user, password=db_pass,
-            connect_timeout=DB_CONNECT_TIMEOUT,
-        )
-        with conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO sentiment_history (fear_greed, vix, summary_text, timestamp) VALUES (%s, %s, %s, %s)",
-                (analysis_data.get("fear_greed"), vix_value, analysis_data.get("summary_text"), timestamp)
-            )
-            conn.commit()
-        conn.close()
+        conn = connect_db()
+        if conn is None:
+            return False
+        model_scores = _model_scores(analysis_data)
+        statements = ((INSERT_WITH_ROLLUPS_SQL, True),) + HISTORY_INSERT_FALLBACKS
+        try:
+            with conn.cursor() as cur:
+                for i, (sql, with_model_scores) in enumerate(statements):
+                    params = (analysis_data.get("fear_greed"), vix_value, analysis_data.get("summary_text"))
+                    params += (model_scores, timestamp) if with_model_scores else (timestamp,)
+                    try:
+                        cur.execute(sql, params)
+                        break
+                    except (psycopg2.errors.UndefinedTable, psycopg2.errors.UndefinedColumn) as error:
+                        if i == len(statements) - 1:
+                            raise
+                        logger.warning("Schema not fully migrated (%s); retrying with a simpler insert.", str(error).strip())
+                        conn.rollback()
+                conn.commit()
+        finally:
+            conn.close()
         logger.info("Saved analysis results to database.")
         return True
     except psycopg2.Error as error:
@@ -231,6 +1201,63 @@ def save_results_to_db(analysis_data, vix_value, timestamp):
         return False
 
 
+def article_rows(articles, seen_at):
+    """Rows for news_articles: one per URL (the last duplicate in the batch
+    wins, since an upsert cannot touch the same row twice), with the lexicon
+    score of each article's title and summary."""
+    unique = list({a["url"]: a for a in articles if a.get("url")}.values())
+    if not unique:
+        return []
+    scores, _ = _lexicon().score_articles(unique)
+    return [
+        (a["url"], a.get("source_name"), a.get("ticker"), a.get("title"), a.get("timestamp"),
+         round(float(score), 4), seen_at, seen_at)
+        for a, score in zip(unique, scores)
+    ]
+
+
+def save_articles_to_db(articles, seen_at):
+    """Upsert the scraped articles into news_articles in pages of
+    ARTICLE_INSERT_PAGE_SIZE rows per statement. Returns the row count, or
+    None when the save was skipped or failed."""
+    rows = article_rows(articles, seen_at)
+    if not rows:
+        return 0
+    try:
+        conn = connect_db()
+        if conn is None:
+            return None
+        started = time.monotonic()
+        try:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO news_articles (url, source_name, ticker, title, published_at, sentiment, first_seen_at, last_seen_at)
+                    VALUES %s
+                    ON CONFLICT (url) DO UPDATE SET
+                        title = EXCLUDED.title,
+                        ticker = COALESCE(EXCLUDED.ticker, news_articles.ticker),
+                        published_at = COALESCE(EXCLUDED.published_at, news_articles.published_at),
+                        sentiment = EXCLUDED.sentiment,
+                        last_seen_at = EXCLUDED.last_seen_at
+                    """,
+                    rows,
+                    page_size=ARTICLE_INSERT_PAGE_SIZE,
+                )
+                conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        logger.info("Upserted %s articles in %.0f ms.", len(rows), 1000 * (time.monotonic() - started))
+        return len(rows)
+    except psycopg2.Error as error:
+        logger.error("Failed to save articles to database: %s", error)
+        return None
+
+
 def save_indices_to_json(analysis_data, vix_value, timestamp, output_path):
     data = {
         "fear_greed": analysis_data.get("fear_greed"),
@@ -238,6 +1265,9 @@ def save_indices_to_json(analysis_data, vix_value, timestamp, output_path):
         "summary_text": analysis_data.get("summary_text"),
         "timestamp_utc": timestamp.isoformat()
     }
+    for key in ("ensemble", "scorer"):
+        if analysis_data.get(key):
+            data[key] = analysis_data[key]
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -258,31 +1288,33 @@ def main():
             "ollama": {"endpoint": "http://localhost:11434/api/generate", "model": "deepseek-r1:1.5b"}
         }
 
-    analysis_text = None
+    parsed_data = None
     if articles:
-        provider = config.get("provider", "ollama")
-        if provider == "ollama":
-            logger.info("Running local analysis using Ollama (%s)...", config.get('ollama', {}).get('model'))
-            analysis_text = analyze_with_ollama(articles, config.get("ollama", {}))
-        else:
-            logger.info("Running cloud analysis...")
-            analysis_text = analyze_with_cloud(articles, config.get("cloud", {}))
+        parsed_data = run_analysis(articles, config)
     else:
         logger.warning("No articles found in %s; run the scraper first.", JSON_NEWS_FILE_PATH)
 
-    if analysis_text:
-        parsed_data = parse_analysis_results(analysis_text)
-    else:
-        logger.error("Analysis produced no output. Check that Ollama is running or cloud API keys are valid.")
+    if not parsed_data or parsed_data.get("fear_greed") is None:
+        logger.error("Analysis produced no usable score. Check that Ollama is running or cloud API keys are valid.")
+        parsed_data = lexicon_fallback(articles) or parsed_data
+    if not parsed_data:
         parsed_data = {"fear_greed": None, "summary_text": "Analysis skipped or failed. Ensure Ollama is running or Cloud API keys are set."}
 
     ts = datetime.now(timezone.utc)
 
-    save_indices_to_json(parsed_data, vix, ts, INDEX_JSON_OUTPUT_PATH)
     if parsed_data.get("fear_greed") is not None:
         save_results_to_db(parsed_data, vix, ts)
     else:
         logger.warning("No Fear & Greed score parsed; skipping database save to avoid storing unreliable data.")
+    if PERSIST_ARTICLES and articles:
+        save_articles_to_db(articles, ts)
+    # Written after the database save: the dashboard cache treats a change
+    # to this file as "new data is in the database".
+    save_indices_to_json(parsed_data, vix, ts, INDEX_JSON_OUTPUT_PATH)
+
+    if _llm_cache_stats["hits"] or _llm_cache_stats["misses"]:
+        logger.info("LLM response cache: %s hits, %s misses", _llm_cache_stats["hits"], _llm_cache_stats["misses"])
+    http_client.log_pool_stats(logger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""Shared, pooled HTTP session for every outbound call made by the pipeline
+scripts, so repeated requests to the same host reuse keep-alive connections
+instead of paying a fresh TCP+TLS handshake each time."""
+
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("http_client")
+
+# Number of distinct host pools kept alive, and connections kept per host.
+# The per-host size should cover the largest fan-out to a single host
+# (e.g. RSS_MAX_WORKERS) or extra connections are opened and discarded.
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "20"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "1.0"))
+HTTP_BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", "10.0"))
+# Extra random delay as a fraction of the exponential delay, so clients
+# retrying the same host do not hammer it in lockstep.
+HTTP_BACKOFF_JITTER = float(os.environ.get("HTTP_BACKOFF_JITTER", "0.5"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use.
+    Retries are handled by request_with_retry, so the adapters themselves
+    never retry (avoiding multiplied attempts)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt):
+    """Delay before retry number `attempt` (1-based): exponential in the
+    attempt, capped at HTTP_BACKOFF_MAX, plus up to HTTP_BACKOFF_JITTER of
+    random extra delay."""
+    delay = min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** (attempt - 1)))
+    return delay + random.uniform(0, delay * HTTP_BACKOFF_JITTER)
+
+
+def request_with_retry(method, url, retries=None, **kwargs):
+    """Send a request through the pooled session, retrying failed attempts
+    (connection errors and HTTP error statuses) with exponential backoff.
+    Returns the response, or None when every attempt failed."""
+    retries = HTTP_MAX_RETRIES if retries is None else max(1, retries)
+    session = get_session()
+    for attempt in range(1, retries + 1):
+        try:
+            response = session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.RequestException as error:
+            logger.warning("Attempt %s/%s failed for %s: %s", attempt, retries, url, error)
+            if attempt < retries:
+                time.sleep(backoff_delay(attempt))
+    return None
+
+
+def pool_stats():
+    """Per-host request and new-connection counts for the shared session's
+    live connection pools. Requests beyond new connections were served by
+    an already-open keep-alive connection."""
+    stats = {}
+    if _session is None:
+        return stats
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {"requests": 0, "new_connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["new_connections"] += pool.num_connections
+    return stats
+
+
+def log_pool_stats(target_logger=None):
+    """Log a one-line summary of connection reuse for the current run."""
+    target_logger = target_logger or logger
+    stats = pool_stats()
+    total_requests = sum(s["requests"] for s in stats.values())
+    total_new = sum(s["new_connections"] for s in stats.values())
+    if not total_requests:
+        return stats
+    reused = max(0, total_requests - total_new)
+    target_logger.info(
+        "HTTP pool: %s requests over %s hosts, %s new connections, %s reused (%.0f%% pool hits)",
+        total_requests, len(stats), total_new, reused, 100.0 * reused / total_requests,
+    )
+    for host, entry in sorted(stats.items()):
+        target_logger.debug("HTTP pool %s: %s requests, %s new connections", host, entry["requests"], entry["new_connections"])
+    return stats
@@ -0,0 +1,100 @@
+"""Offline finance-lexicon sentiment scorer. Scores every article's title
+and summary in one vectorized NumPy pass, so it runs in milliseconds and
+needs no model: analyze_news uses it to rank articles before building the
+LLM prompt and as a fallback score when no LLM answers."""
+
+import re
+
+import numpy as np
+
+# Word weights in [-2, 2]; loosely based on the Loughran-McDonald finance
+# word lists, plus market slang common in headlines.
+LEXICON = {
+    # Strongly positive
+    "soar": 2, "soars": 2, "soared": 2, "surge": 2, "surges": 2, "surged": 2, "skyrocket": 2, "skyrockets": 2,
+    "record": 1.5, "boom": 2, "booming": 2, "rally": 1.5, "rallies": 1.5, "rallied": 1.5, "euphoria": 2,
+    "breakout": 1.5, "blowout": 1.5, "all-time": 1.5,
+    # Positive
+    "gain": 1, "gains": 1, "gained": 1, "rise": 1, "rises": 1, "rising": 1, "rose": 1, "jump": 1, "jumps": 1,
+    "jumped": 1, "climb": 1, "climbs": 1, "climbed": 1, "rebound": 1, "rebounds": 1, "recovery": 1, "recover": 1,
+    "beat": 1, "beats": 1, "upgrade": 1, "upgraded": 1, "upbeat": 1, "bullish": 1.5, "optimism": 1, "optimistic": 1,
+    "strong": 1, "stronger": 1, "growth": 1, "profit": 1, "profits": 1, "outperform": 1, "higher": 0.5,
+    "confidence": 1, "easing": 0.5, "boost": 1, "boosts": 1, "upside": 1,
+    "buyback": 1, "dividend": 0.5, "expansion": 1, "robust": 1, "resilient": 1, "greed": 1,
+    # Negative
+    "fall": -1, "falls": -1, "fell": -1, "drop": -1, "drops": -1, "dropped": -1, "decline": -1, "declines": -1,
+    "declined": -1, "slip": -1, "slips": -1, "slide": -1, "slides": -1, "lower": -0.5, "loss": -1, "losses": -1,
+    "miss": -1, "misses": -1, "downgrade": -1, "downgraded": -1, "weak": -1, "weaker": -1, "bearish": -1.5,
+    "concern": -1, "concerns": -1, "worry": -1, "worries": -1, "fear": -1, "fears": -1, "risk": -0.5,
+    "risks": -0.5, "uncertainty": -1, "volatile": -1, "volatility": -1, "slowdown": -1, "inflation": -0.5,
+    "tariff": -1, "tariffs": -1, "layoffs": -1, "layoff": -1, "warning": -1, "warns": -1, "probe": -1,
+    "lawsuit": -1, "default": -1.5, "deficit": -0.5, "downside": -1, "tumble": -1.5, "tumbles": -1.5,
+    "tumbled": -1.5, "sell-off": -1.5, "selloff": -1.5,
+    # Strongly negative
+    "crash": -2, "crashes": -2, "crashed": -2, "plunge": -2, "plunges": -2, "plunged": -2, "collapse": -2,
+    "collapses": -2, "panic": -2, "recession": -2, "bankruptcy": -2, "bankrupt": -2, "crisis": -2, "turmoil": -2,
+    "rout": -2, "meltdown": -2, "capitulation": -2, "contagion": -2,
+}
+# Headlines carry most of the signal; summaries are often boilerplate.
+TITLE_WEIGHT = 2.0
+SUMMARY_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z][a-z'-]*")
+_VOCAB = {word: i for i, word in enumerate(LEXICON)}
+_WEIGHTS = np.array(list(LEXICON.values()), dtype=float)
+
+
+def _token_indices(text):
+    return [_VOCAB[t] for t in _TOKEN_RE.findall((text or "").lower()) if t in _VOCAB]
+
+
+def score_articles(articles):
+    """Per-article sentiment in [-1, 1] (0 when no lexicon word appears)
+    and the number of lexicon hits per article, as NumPy arrays."""
+    rows, cols, values = [], [], []
+    for i, article in enumerate(articles):
+        for weight, text in ((TITLE_WEIGHT, article.get("title")), (SUMMARY_WEIGHT, article.get("summary"))):
+            indices = _token_indices(text)
+            rows.extend([i] * len(indices))
+            cols.extend(indices)
+            values.extend([weight] * len(indices))
+
+    counts = np.zeros((len(articles), len(_VOCAB)))
+    np.add.at(counts, (np.array(rows, dtype=int), np.array(cols, dtype=int)), np.array(values))
+    hits = counts.sum(axis=1)
+    # Dividing by sqrt(hits) keeps long, wordy summaries from saturating.
+    scores = np.tanh((counts @ _WEIGHTS) / np.sqrt(np.maximum(hits, 1.0)))
+    return scores, hits
+
+
+def fear_greed_index(scores, hits):
+    """Map per-article scores to a 0-100 Fear & Greed value, averaging over
+    articles that contained at least one lexicon word (50 if none did)."""
+    mask = hits > 0
+    if not mask.any():
+        return 50
+    return int(round(50 + 50 * float(scores[mask].mean())))
+
+
+def rank_articles(articles, limit=0):
+    """Articles ordered by sentiment strength (|score|, strongest first,
+    ties kept in original order), truncated to `limit` when it is > 0."""
+    if not articles:
+        return []
+    scores, _ = score_articles(articles)
+    order = np.argsort(-np.abs(scores), kind="stable")
+    if limit > 0:
+        order = order[:limit]
+    return [articles[i] for i in order]
+
+
+def analyze(articles):
+    """Score a batch of articles; returns the aggregate index and counts."""
+    scores, hits = score_articles(articles)
+    return {
+        "fear_greed": fear_greed_index(scores, hits),
+        "articles": len(articles),
+        "scored": int((hits > 0).sum()),
+        "positive": int((scores > 0.1).sum()),
+        "negative": int((scores < -0.1).sum()),
+    }
@@ -3,11 +3,15 @@ the current VIX value, writing the combined result to a JSON file consumed
 by the analysis step of the pipeline."""
 
 import html
+import importlib.util
 import json
 import logging
 import os
 import re
+import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
 
 logging.basicConfig(
@@ -16,26 +20,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger("webScrape")
 
-try:
-    import feedparser
-    FEEDPARSER_AVAILABLE = True
-except ImportError:
-    FEEDPARSER_AVAILABLE = False
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
-except ImportError:
-    YFINANCE_AVAILABLE = False
+# Heavy optional dependencies (yfinance pulls in pandas) are only located
+# here and imported on first use, so callers that need just one path, such
+# as the alert monitor's VIX lookup, do not pay for the rest.
+FEEDPARSER_AVAILABLE = importlib.util.find_spec("feedparser") is not None
+YFINANCE_AVAILABLE = importlib.util.find_spec("yfinance") is not None
+BS4_AVAILABLE = importlib.util.find_spec("bs4") is not None
+
+feedparser = None
+yf = None
+BeautifulSoup = None
+
+
+def _feedparser():
+    global feedparser
+    if feedparser is None:
+        import feedparser as module
+        feedparser = module
+    return feedparser
+
+
+def _yfinance():
+    global yf
+    if yf is None:
+        import yfinance as module
+        yf = module
+    return yf
+
+
+def _beautiful_soup():
+    global BeautifulSoup
+    if BeautifulSoup is None:
+        from bs4 import BeautifulSoup as soup_class
+        BeautifulSoup = soup_class
+    return BeautifulSoup
+
+
+def preload_dependencies():
+    """Import every optional dependency now. Long-lived callers (the
+    in-process scheduler) use this so forked job runs inherit them."""
+    started = time.monotonic()
+    for available, loader in ((FEEDPARSER_AVAILABLE, _feedparser), (YFINANCE_AVAILABLE, _yfinance), (BS4_AVAILABLE, _beautiful_soup)):
+        if available:
+            loader()
+    logger.debug("Preloaded scraper dependencies in %.2fs", time.monotonic() - started)
 
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
 
 try:
-    import requests
+    from website.crucialPys import http_client
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -55,17 +91,48 @@ ALL_RSS_FEEDS = [
 ]
 
 MAX_ARTICLES_PER_FEED = 25
+# Upper bound on feeds fetched at the same time; 1 restores serial fetching.
+RSS_MAX_WORKERS = int(os.environ.get("RSS_MAX_WORKERS", "10"))
 YAHOO_TICKERS = ['^GSPC', '^IXIC', '^DJI', '^VIX', 'AAPL', 'MSFT', 'NVDA', 'GOOGL', 'AMZN', 'META']
 MAX_ARTICLES_PER_TICKER = 10
+# Bounded fan-out for per-ticker news lookups; the pool size stays fixed
+# however long YAHOO_TICKERS grows. 1 restores serial fetching.
+YF_MAX_WORKERS = int(os.environ.get("YF_MAX_WORKERS", "8"))
+# YF_REQUEST_TIMEOUT is passed to yfinance's HTTP call. YF_TICKER_TIMEOUT
+# bounds how long the merge waits for a whole lookup (which may also fetch
+# Yahoo's cookie/crumb first); it defaults to the request timeout plus a
+# small margin, so a hung lookup is skipped soon after its request would
+# have timed out, and it cannot stop the request itself.
+YF_REQUEST_TIMEOUT = float(os.environ.get("YF_REQUEST_TIMEOUT", "10"))
+YF_TICKER_TIMEOUT = float(os.environ.get("YF_TICKER_TIMEOUT", str(YF_REQUEST_TIMEOUT + 2)))
 MAX_TOTAL_ARTICLES = 300
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 WEBSITE_DIR = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(WEBSITE_DIR, "data_files")
 OUTPUT_FILENAME = "financial_news_agg.json"
-
-MAX_RETRIES = 3
-RETRY_DELAY = 2
+# Per-feed ETag/Last-Modified validators plus the articles parsed from the
+# last full response, so unchanged feeds can be served from a 304.
+RSS_CACHE_PATH = os.path.join(OUTPUT_DIR, "rss_cache.json")
+RSS_CACHE_ENABLED = os.environ.get("RSS_CACHE_ENABLED", "1") == "1"
+
+# VIX sources are hedged: the next source starts after VIX_HEDGE_DELAY
+# seconds without an answer (or as soon as one fails); 0 races them all.
+VIX_HEDGE_DELAY = float(os.environ.get("VIX_HEDGE_DELAY", "2"))
+VIX_RESOLVE_TIMEOUT = float(os.environ.get("VIX_RESOLVE_TIMEOUT", "30"))
+# Per-source success rate and latency (exponentially weighted), used to try
+# the historically fastest healthy source first.
+VIX_STATS_PATH = os.path.join(OUTPUT_DIR, "vix_source_stats.json")
+VIX_STATS_ALPHA = 0.3
+VIX_MIN_SUCCESS_RATE = 0.5
+VIX_MIN_ATTEMPTS_FOR_HEALTH = 3
+# Last resolved quote, shared by the scraper and the alert monitor so a
+# fresh quote from either process is reused instead of fetched again.
+# 0 disables the cache.
+VIX_QUOTE_PATH = os.path.join(OUTPUT_DIR, "vix_quote.json")
+VIX_CACHE_TTL_SECONDS = float(os.environ.get("VIX_CACHE_TTL_SECONDS", "240"))
+
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
 REQUEST_TIMEOUT = 15
 
 BROWSER_USER_AGENT = (
@@ -74,21 +141,47 @@ BROWSER_USER_AGENT = (
 )
 
 
+def _get_with_retry(url, headers=None):
+    """GET a URL through the pooled session, retrying up to MAX_RETRIES
+    times with exponential backoff. Returns the response (including 304 Not
+    Modified), or None when every attempt failed."""
+    if not REQUESTS_AVAILABLE:
+        return None
+    return http_client.request_with_retry("GET", url, retries=MAX_RETRIES, headers=headers, timeout=REQUEST_TIMEOUT)
+
+
 def fetch_url_with_retry(url, headers=None):
     """Fetch a URL, retrying up to MAX_RETRIES times. Returns the raw
     response body, or None when every attempt failed."""
-    if not REQUESTS_AVAILABLE:
-        return None
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException as error:
-            logger.warning("Attempt %s/%s failed for %s: %s", attempt, MAX_RETRIES, url, error)
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY)
-    return None
+    response = _get_with_retry(url, headers=headers)
+    return response.content if response is not None else None
+
+
+def load_rss_cache(path=None):
+    path = path or RSS_CACHE_PATH
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError) as error:
+        logger.warning("Could not read RSS cache %s: %s", path, error)
+        return {}
+
+
+def save_rss_cache(cache, path=None):
+    path = path or RSS_CACHE_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as error:
+        logger.warning("Could not write RSS cache %s: %s", path, error)
+        return False
 
 
 def clean_html_summary(summary_html):
@@ -97,7 +190,7 @@ def clean_html_summary(summary_html):
     summary_text = summary_html
     if BS4_AVAILABLE and ('<' in summary_text and '>' in summary_text):
         try:
-            soup = BeautifulSoup(summary_html, "html.parser")
+            soup = _beautiful_soup()(summary_html, "html.parser")
             summary_text = ' '.join(soup.stripped_strings)
         except Exception:
             summary_text = re.sub('<[^<]+?>', ' ', summary_html)
@@ -149,36 +242,98 @@ def format_timestamp_from_parsed(parsed_struct_time):
     return format_timestamp(parsed_struct_time)
 
 
-def get_rss_news():
+def _fetch_feed(url, cached=None):
+    """Fetch one RSS feed and return (response, wall time in seconds).
+    When a cached entry with articles exists its validators are sent, so an
+    unchanged feed answers with a cheap 304."""
+    headers = {'User-Agent': BROWSER_USER_AGENT}
+    if cached and cached.get('articles'):
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    started = time.monotonic()
+    response = _get_with_retry(url, headers=headers)
+    return response, time.monotonic() - started
+
+
+def _parse_feed_articles(content, source_name):
+    """Parse a feed body into article dicts for every entry with a link."""
+    feed = _feedparser().parse(content)
+    articles = []
+    for entry in feed.entries:
+        link = entry.get('link')
+        if not link:
+            continue
+        articles.append({
+            'title': clean_html_summary(entry.get('title', 'N/A')),
+            'url': link,
+            'summary': clean_html_summary(entry.get('description', entry.get('summary', 'N/A'))),
+            'timestamp': format_timestamp(entry.get('published_parsed') or entry.get('published')),
+            'source_name': f"RSS ({source_name})"
+        })
+    return articles
+
+
+def get_rss_news(max_workers=None):
+    """Fetch every feed in ALL_RSS_FEEDS concurrently (at most max_workers
+    in flight, RSS_MAX_WORKERS by default) and merge them in list order, so
+    the per-feed cap and cross-feed link dedup give the same result as a
+    serial run. Feeds answering 304 reuse the articles cached from their
+    last full response."""
     if not FEEDPARSER_AVAILABLE or not REQUESTS_AVAILABLE:
         logger.warning("feedparser/requests not available; skipping RSS news.")
         return []
+    if max_workers is None:
+        max_workers = RSS_MAX_WORKERS
+    max_workers = max(1, min(max_workers, len(ALL_RSS_FEEDS)))
+
+    cache = load_rss_cache() if RSS_CACHE_ENABLED else {}
     all_news, processed_links = [], set()
-    for source_name, url in ALL_RSS_FEEDS:
-        content = fetch_url_with_retry(url, headers={'User-Agent': BROWSER_USER_AGENT})
-        if content is None:
-            logger.warning("Could not fetch RSS feed %s (%s)", source_name, url)
-            continue
-        try:
-            feed = feedparser.parse(content)
+    not_modified = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rss") as executor:
+        futures = [executor.submit(_fetch_feed, url, cache.get(url)) for _, url in ALL_RSS_FEEDS]
+        for (source_name, url), future in zip(ALL_RSS_FEEDS, futures):
+            try:
+                response, elapsed = future.result()
+            except Exception:
+                logger.exception("Unexpected error fetching RSS feed %s (%s)", source_name, url)
+                continue
+            if response is None:
+                logger.warning("Could not fetch RSS feed %s (%s) after %.2fs", source_name, url, elapsed)
+                continue
+            try:
+                if response.status_code == 304 and cache.get(url, {}).get('articles'):
+                    feed_articles = cache[url]['articles']
+                    not_modified += 1
+                else:
+                    feed_articles = _parse_feed_articles(response.content, source_name)
+                    cache[url] = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'articles': feed_articles,
+                    }
+            except Exception:
+                logger.exception("Failed to parse RSS feed %s", source_name)
+                continue
+
             count = 0
-            for entry in feed.entries:
+            for article in feed_articles:
                 if count >= MAX_ARTICLES_PER_FEED:
                     break
-                link = entry.get('link')
-                if link and link not in processed_links:
-                    processed_links.add(link)
-                    all_news.append({
-                        'title': clean_html_summary(entry.get('title', 'N/A')),
-                        'url': link,
-                        'summary': clean_html_summary(entry.get('description', entry.get('summary', 'N/A'))),
-                        'timestamp': format_timestamp(entry.get('published_parsed') or entry.get('published')),
-                        'source_name': f"RSS ({source_name})"
-                    })
+                if article['url'] not in processed_links:
+                    processed_links.add(article['url'])
+                    all_news.append(article)
                     count += 1
-            logger.info("Fetched %s articles from %s", count, source_name)
-        except Exception:
-            logger.exception("Failed to parse RSS feed %s", source_name)
+            logger.info("Fetched %s articles from %s in %.2fs%s", count, source_name, elapsed,
+                        " (not modified)" if response.status_code == 304 else "")
+    logger.info("Fetched %s RSS feeds in %.2fs (max %s in flight, %s not modified)",
+                len(ALL_RSS_FEEDS), time.monotonic() - started, max_workers, not_modified)
+    if RSS_CACHE_ENABLED:
+        # Drop feeds that are no longer configured so the file stays bounded.
+        configured = {url for _, url in ALL_RSS_FEEDS}
+        save_rss_cache({url: entry for url, entry in cache.items() if url in configured})
     return all_news
 
 
@@ -209,15 +364,60 @@ def _normalize_yfinance_item(news_item):
     }
 
 
-def get_yfinance_news(tickers):
+def _fetch_ticker_news(ticker_symbol, started_at):
+    started_at[ticker_symbol] = time.monotonic()
+    # Ticker.news takes no timeout; Search does, and returns the symbol's
+    # news in the legacy flat item format.
+    search = _yfinance().Search(ticker_symbol, max_results=0, news_count=MAX_ARTICLES_PER_TICKER, lists_count=0,
+                                recommended=0, include_cb=False, timeout=YF_REQUEST_TIMEOUT)
+    return search.news or []
+
+
+def _wait_for_ticker(future, ticker_symbol, started_at, timeout):
+    """Wait for a ticker lookup, allowing `timeout` seconds from the moment a
+    worker actually picked it up (queued time does not count). Raises
+    FutureTimeoutError once that budget is spent."""
+    while True:
+        start = started_at.get(ticker_symbol)
+        remaining = timeout if start is None else start + timeout - time.monotonic()
+        try:
+            return future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            if started_at.get(ticker_symbol) is not None and time.monotonic() >= started_at[ticker_symbol] + timeout:
+                raise
+
+
+def get_yfinance_news(tickers, max_workers=None, ticker_timeout=None):
+    """Fetch news for each ticker across at most max_workers threads
+    (YF_MAX_WORKERS by default), giving each lookup ticker_timeout seconds.
+    Results are merged in ticker order, so URL dedup and the per-ticker cap
+    match a serial run."""
     if not YFINANCE_AVAILABLE:
         logger.warning("yfinance not available; skipping Yahoo Finance news.")
         return []
+    tickers = list(tickers)
+    if not tickers:
+        return []
+    max_workers = max(1, min(YF_MAX_WORKERS if max_workers is None else max_workers, len(tickers)))
+    ticker_timeout = YF_TICKER_TIMEOUT if ticker_timeout is None else ticker_timeout
+
     all_news, processed_links = [], set()
-    for ticker_symbol in tickers:
-        try:
-            ticker = yf.Ticker(ticker_symbol)
-            news_list = ticker.news or []
+    started_at = {}
+    started = time.monotonic()
+    # Not a context manager: a hung lookup must not block the merge once its
+    # timeout has expired, so the pool is shut down without waiting.
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yfinance")
+    try:
+        futures = [executor.submit(_fetch_ticker_news, symbol, started_at) for symbol in tickers]
+        for ticker_symbol, future in zip(tickers, futures):
+            try:
+                news_list = _wait_for_ticker(future, ticker_symbol, started_at, ticker_timeout)
+            except FutureTimeoutError:
+                logger.warning("Yahoo Finance news for %s timed out after %ss", ticker_symbol, ticker_timeout)
+                continue
+            except Exception as error:
+                logger.warning("Failed to fetch Yahoo Finance news for %s: %s", ticker_symbol, error)
+                continue
             count = 0
             for news_item in news_list:
                 if count >= MAX_ARTICLES_PER_TICKER:
@@ -225,82 +425,274 @@ def get_yfinance_news(tickers):
                 article = _normalize_yfinance_item(news_item)
                 if article and article['url'] not in processed_links:
                     processed_links.add(article['url'])
+                    article['ticker'] = ticker_symbol
                     all_news.append(article)
                     count += 1
-        except Exception as error:
-            logger.warning("Failed to fetch Yahoo Finance news for %s: %s", ticker_symbol, error)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info("Fetched %s Yahoo Finance articles for %s tickers in %.2fs (max %s in flight)",
+                len(all_news), len(tickers), time.monotonic() - started, max_workers)
     return all_news
 
 
-def get_vix_value():
-    # 1. Try yfinance primary method
+def _vix_from_yfinance_history():
+    hist = _yfinance().Ticker("^VIX").history(period="5d", timeout=5)
+    if not hist.empty:
+        return float(hist['Close'].iloc[-1])
+    return None
+
+
+def _vix_from_yfinance_fast_info():
+    ticker = _yfinance().Ticker("^VIX")
+    if hasattr(ticker, 'fast_info'):
+        val = ticker.fast_info.get('last_price')
+        if val:
+            return float(val)
+    return None
+
+
+def _vix_from_cnbc():
+    url = "https://quote.cnbc.com/quote-html-webservice/quote.htm?symbols=.VIX&output=json&noform=1&partnerId=2"
+    response = http_client.get_session().get(url, headers={'User-Agent': BROWSER_USER_AGENT}, timeout=10)
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    root = data.get('QuickQuoteResult') or data.get('ExtendedQuoteResult')
+    price = None
+    if root:
+        extended_quotes = root.get('ExtendedQuote')
+        if extended_quotes and isinstance(extended_quotes, list) and len(extended_quotes) > 0:
+            price = extended_quotes[0].get('QuickQuote', {}).get('last')
+        else:
+            # Handle case-sensitivity (some versions use 'QuickQuote', some 'quickquote')
+            quickquote = root.get('QuickQuote') or root.get('quickquote')
+            if isinstance(quickquote, list) and len(quickquote) > 0:
+                price = quickquote[0].get('last')
+            elif isinstance(quickquote, dict):
+                price = quickquote.get('last')
+    return float(price) if price else None
+
+
+def _vix_from_stooq():
+    url = "https://stooq.com/q/l/?s=%5evix&f=sd2t2ohlcv&h&e=csv"
+    response = http_client.get_session().get(url, headers={'User-Agent': BROWSER_USER_AGENT}, timeout=10)
+    if response.status_code != 200:
+        return None
+    lines = response.text.strip().split('\n')
+    if len(lines) > 1:
+        data = lines[1].split(',')
+        if len(data) >= 7 and data[6] != 'N/D':
+            return float(data[6])
+    return None
+
+
+def _available_vix_sources():
+    """VIX sources in their default priority order: yfinance history, then
+    fast_info, then the CNBC quote API, then Stooq."""
+    sources = []
     if YFINANCE_AVAILABLE:
-        try:
-            ticker = yf.Ticker("^VIX")
-            hist = ticker.history(period="5d", timeout=5)
-            if not hist.empty:
-                return float(hist['Close'].iloc[-1])
-        except Exception as error:
-            logger.warning("yfinance history lookup for VIX failed: %s", error)
-
-        # 2. Try yfinance fast_info
-        try:
-            ticker = yf.Ticker("^VIX")
-            if hasattr(ticker, 'fast_info'):
-                val = ticker.fast_info.get('last_price')
-                if val:
-                    return float(val)
-        except Exception as error:
-            logger.warning("yfinance fast_info lookup for VIX failed: %s", error)
-
-    # 3. Fallback: CNBC public quote API
+        sources += [('yfinance_history', _vix_from_yfinance_history), ('yfinance_fast_info', _vix_from_yfinance_fast_info)]
     if REQUESTS_AVAILABLE:
-        try:
-            url = "https://quote.cnbc.com/quote-html-webservice/quote.htm?symbols=.VIX&output=json&noform=1&partnerId=2"
-            response = requests.get(url, headers={'User-Agent': BROWSER_USER_AGENT}, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                root = data.get('QuickQuoteResult') or data.get('ExtendedQuoteResult')
-                price = None
-                if root:
-                    extended_quotes = root.get('ExtendedQuote')
-                    if extended_quotes and isinstance(extended_quotes, list) and len(extended_quotes) > 0:
-                        price = extended_quotes[0].get('QuickQuote', {}).get('last')
-                    else:
-                        # Handle case-sensitivity (some versions use 'QuickQuote', some 'quickquote')
-                        quickquote = root.get('QuickQuote') or root.get('quickquote')
-                        if isinstance(quickquote, list) and len(quickquote) > 0:
-                            price = quickquote[0].get('last')
-                        elif isinstance(quickquote, dict):
-                            price = quickquote.get('last')
-
-                    if price:
-                        return float(price)
-        except Exception as error:
-            logger.warning("CNBC VIX fallback failed: %s", error)
-
-    # 4. Emergency fallback: Stooq
-    if REQUESTS_AVAILABLE:
-        try:
-            url = "https://stooq.com/q/l/?s=%5evix&f=sd2t2ohlcv&h&e=csv"
-            response = requests.get(url, headers={'User-Agent': BROWSER_USER_AGENT}, timeout=10)
-            if response.status_code == 200:
-                lines = response.text.strip().split('\n')
-                if len(lines) > 1:
-                    data = lines[1].split(',')
-                    if len(data) >= 7 and data[6] != 'N/D':
-                        return float(data[6])
-        except Exception as error:
-            logger.warning("Stooq VIX fallback failed: %s", error)
-
-    logger.error("All VIX data sources failed; VIX will be reported as unavailable.")
-    return None
+        sources += [('cnbc', _vix_from_cnbc), ('stooq', _vix_from_stooq)]
+    return sources
+
+
+def load_vix_stats(path=None):
+    path = path or VIX_STATS_PATH
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        return stats if isinstance(stats, dict) else {}
+    except (OSError, ValueError) as error:
+        logger.warning("Could not read VIX source stats %s: %s", path, error)
+        return {}
+
+
+def save_vix_stats(stats, path=None):
+    path = path or VIX_STATS_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as error:
+        logger.warning("Could not write VIX source stats %s: %s", path, error)
+        return False
+
+
+def record_vix_attempt(stats, name, success, latency):
+    entry = stats.setdefault(name, {"attempts": 0, "successes": 0, "success_rate": 1.0, "latency_ewma": None})
+    entry["attempts"] += 1
+    entry["successes"] += 1 if success else 0
+    entry["success_rate"] = round((1 - VIX_STATS_ALPHA) * entry["success_rate"] + VIX_STATS_ALPHA * (1.0 if success else 0.0), 4)
+    if success:
+        previous = entry["latency_ewma"]
+        entry["latency_ewma"] = round(latency if previous is None else (1 - VIX_STATS_ALPHA) * previous + VIX_STATS_ALPHA * latency, 4)
+    entry["last_attempt_utc"] = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+    return entry
+
+
+def order_vix_sources(sources, stats):
+    """Healthy sources first, fastest (by latency EWMA) first among them.
+    Sources without enough history keep their default position after the
+    measured healthy ones; unhealthy sources go last."""
+    def sort_key(indexed):
+        index, (name, _) = indexed
+        entry = stats.get(name) or {}
+        unhealthy = entry.get("attempts", 0) >= VIX_MIN_ATTEMPTS_FOR_HEALTH and entry.get("success_rate", 1.0) < VIX_MIN_SUCCESS_RATE
+        latency = entry.get("latency_ewma")
+        return (unhealthy, latency is None, latency or 0.0, index)
+    return [source for _, source in sorted(enumerate(sources), key=sort_key)]
+
+
+def _timed_vix_call(fetch):
+    started = time.monotonic()
+    try:
+        value, error = fetch(), None
+    except Exception as exc:
+        value, error = None, exc
+    return value, time.monotonic() - started, error
+
+
+def _resolve_vix(hedge_delay=None, timeout=None):
+    """Resolve the current VIX from the first source returning a valid
+    quote. Sources are tried in adaptive order and hedged: the next one is
+    launched when the running ones have not answered within hedge_delay
+    seconds or one of them fails. Returns (value, source name), or
+    (None, None) when every source fails."""
+    hedge_delay = VIX_HEDGE_DELAY if hedge_delay is None else hedge_delay
+    timeout = VIX_RESOLVE_TIMEOUT if timeout is None else timeout
+    stats = load_vix_stats()
+    queue = order_vix_sources(_available_vix_sources(), stats)
+    if not queue:
+        logger.error("No VIX data sources available; VIX will be reported as unavailable.")
+        return None, None
+
+    executor = ThreadPoolExecutor(max_workers=len(queue), thread_name_prefix="vix")
+    pending = {}
+
+    def launch_next():
+        name, fetch = queue.pop(0)
+        pending[executor.submit(_timed_vix_call, fetch)] = name
+
+    value = source = None
+    deadline = time.monotonic() + timeout
+    try:
+        launch_next()
+        while hedge_delay <= 0 and queue:
+            launch_next()
+        while pending and value is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("VIX resolution timed out after %ss (still waiting on %s)", timeout, ", ".join(pending.values()))
+                break
+            done, _ = wait(pending, timeout=min(remaining, hedge_delay) if queue else remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                # Once every source is running there is nothing left to
+                # hedge with; keep waiting until the deadline.
+                if queue:
+                    launch_next()
+                continue
+            failures = 0
+            for future in done:
+                name = pending.pop(future)
+                result, elapsed, error = future.result()
+                success = result is not None and result > 0
+                record_vix_attempt(stats, name, success, elapsed)
+                if success and value is None:
+                    value, source = result, name
+                    logger.info("VIX %.2f from %s in %.2fs", value, name, elapsed)
+                elif not success:
+                    failures += 1
+                    logger.warning("VIX source %s failed after %.2fs: %s", name, elapsed, error or "no valid quote")
+            # A failed source is replaced straight away instead of waiting
+            # out the hedge delay.
+            while value is None and failures and queue:
+                launch_next()
+                failures -= 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        save_vix_stats(stats)
+
+    if value is None:
+        logger.error("All VIX data sources failed; VIX will be reported as unavailable.")
+    return value, source
+
+
+def load_vix_quote(max_age=None, path=None):
+    """Return the cached quote dict if it is younger than max_age seconds
+    (VIX_CACHE_TTL_SECONDS by default), else None."""
+    max_age = VIX_CACHE_TTL_SECONDS if max_age is None else max_age
+    path = path or VIX_QUOTE_PATH
+    if max_age <= 0 or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            quote = json.load(f)
+        fetched_at = datetime.fromisoformat(quote["timestamp_utc"])
+        # Quotes are written in UTC; a naive timestamp is read as UTC too.
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc) if fetched_at.tzinfo is None else fetched_at.astimezone(timezone.utc)
+        age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+        vix = float(quote["vix"])
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        logger.warning("Ignoring unreadable VIX quote cache %s: %s", path, error)
+        return None
+    if age < 0 or age > max_age:
+        return None
+    return {"vix": vix, "source": quote.get("source"), "timestamp_utc": quote["timestamp_utc"]}
+
+
+def save_vix_quote(quote, path=None):
+    path = path or VIX_QUOTE_PATH
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(quote, f)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as error:
+        logger.warning("Could not write VIX quote cache %s: %s", path, error)
+        return False
+
+
+def get_vix_quote(max_age=None, hedge_delay=None, timeout=None):
+    """Return {"vix", "source", "timestamp_utc", "cached"} for the current
+    VIX, reusing a cached quote younger than max_age seconds. Returns None
+    when no fresh quote is cached and every source fails."""
+    cached = load_vix_quote(max_age)
+    if cached:
+        logger.info("Using cached VIX %.2f from %s (%s)", cached["vix"], cached["source"], cached["timestamp_utc"])
+        return {**cached, "cached": True}
+
+    value, source = _resolve_vix(hedge_delay=hedge_delay, timeout=timeout)
+    if value is None:
+        return None
+    quote = {
+        "vix": value,
+        "source": source,
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+    }
+    if (VIX_CACHE_TTL_SECONDS if max_age is None else max_age) > 0:
+        save_vix_quote(quote)
+    return {**quote, "cached": False}
+
+
+def get_vix_value(max_age=None, hedge_delay=None, timeout=None):
+    """Current VIX as a float (see get_vix_quote), or None."""
+    quote = get_vix_quote(max_age=max_age, hedge_delay=hedge_delay, timeout=timeout)
+    return quote["vix"] if quote else None
 
 
 def main():
     logger.info("Scraping live news (no API keys required)...")
     master_news_list = get_rss_news() + get_yfinance_news(YAHOO_TICKERS)
-    vix = get_vix_value()
+    vix_quote = get_vix_quote()
+    vix = vix_quote["vix"] if vix_quote else None
 
     unique_news = []
     seen_urls = set()
@@ -317,7 +709,10 @@ def main():
     output_data = {
         "vix_data": {
             "vix": vix,
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z'),
+            "source": vix_quote["source"] if vix_quote else None,
+            # When the quote came from the cache, report when it was fetched.
+            "timestamp_utc": (vix_quote["timestamp_utc"] if vix_quote else
+                              datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')),
         },
         "articles": unique_news
     }
@@ -327,6 +722,8 @@ def main():
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
     logger.info("Saved %s articles (VIX=%s) to %s", len(unique_news), vix, output_path)
+    if REQUESTS_AVAILABLE:
+        http_client.log_pool_stats(logger)
     return len(unique_news)
 
 
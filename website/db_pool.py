@@ -0,0 +1,148 @@
+"""Small thread-safe PostgreSQL connection pool for the Flask app.
+
+Unlike psycopg2.pool.ThreadedConnectionPool it waits (up to a timeout) for a
+connection when the pool is exhausted instead of failing immediately, and it
+health-checks connections on checkout so a connection dropped by the server
+or a restart is replaced rather than handed to a request."""
+
+import logging
+import threading
+import time
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger("db_pool")
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the acquisition timeout."""
+
+
+class ConnectionPool:
+    def __init__(self, connect, minconn=1, maxconn=5, acquire_timeout=5.0, healthcheck_interval=30.0):
+        self._connect = connect
+        self.minconn = max(0, minconn)
+        self.maxconn = max(1, maxconn, self.minconn)
+        self.acquire_timeout = acquire_timeout
+        self.healthcheck_interval = healthcheck_interval
+        self._idle = deque()  # (connection, monotonic time it was returned)
+        self._in_use = {}  # id(connection) -> connection
+        self._size = 0
+        self._waiting = 0
+        self._timeouts = 0
+        self._cond = threading.Condition()
+        for _ in range(self.minconn):
+            try:
+                self._idle.append((self._connect(), time.monotonic()))
+                self._size += 1
+            except psycopg2.Error as error:
+                logger.warning("Could not pre-open pooled connection: %s", error)
+                break
+
+    def _healthy(self, conn, idle_seconds):
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if idle_seconds < self.healthcheck_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self, timeout=None):
+        """Check out a healthy connection, opening a new one while below
+        maxconn. Raises PoolTimeout when none frees up within `timeout`
+        seconds (acquire_timeout by default) and psycopg2.Error when a new
+        connection cannot be opened."""
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"no database connection available within {self.acquire_timeout}s")
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    conn, returned_at = None, None
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._healthy(conn, time.monotonic() - returned_at):
+                logger.info("Discarding unhealthy pooled connection.")
+                self._discard(conn)
+                with self._cond:
+                    self._size -= 1
+                continue
+
+            with self._cond:
+                self._in_use[id(conn)] = conn
+            return conn
+
+    def owns(self, conn):
+        with self._cond:
+            return id(conn) in self._in_use
+
+    def putconn(self, conn, discard=False):
+        """Return a checked-out connection. Any open transaction is rolled
+        back; broken or discarded connections are closed."""
+        with self._cond:
+            self._in_use.pop(id(conn), None)
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        with self._cond:
+            if discard or conn.closed:
+                self._discard(conn)
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+                self._size -= 1
+
+    def stats(self):
+        with self._cond:
+            in_use = len(self._in_use)
+            return {
+                "size": self._size,
+                "in_use": in_use,
+                "idle": len(self._idle),
+                "max": self.maxconn,
+                "waiting": self._waiting,
+                "timeouts": self._timeouts,
+                "utilization": round(in_use / self.maxconn, 2),
+            }